@@ -1,116 +1,153 @@
 #!/usr/bin/env python3
 
+import sys
+from contextlib import ExitStack
+from itertools import chain, islice
 from pathlib import PurePath
 from subprocess import CompletedProcess
+from typing import TextIO, Iterable
 
 from boxtools.data.Color import ShellColor as Color
 import collections.abc
 
 from boxtools.exception.Exceptions import ParseException
 from boxtools.data.util.Settings import Settings
-from boxtools.data.access.fileAccess import get_box_config_ini_file_path, write_to_file
+from boxtools.data.util.FileStampCache import FileStampCache
+from boxtools.data.access.fileAccess import get_box_config_ini_file_path
+from boxtools.data.util.fileUtils import atomic_open
+from boxtools.data.util.jsonLogUtils import format_json_event
 from boxtools.data.util.stringUtils import new_line
 
 
+# Number of characters buffered by table renderers (show_array, stream_table) before writing them out
+TABLE_CHUNK_SIZE: int = 64 * 1024
+# Number of leading rows used to compute column widths when a table is streamed from a generator
+TABLE_SAMPLE_SIZE: int = 1000
+TABLE_SEPARATOR: str = ' | '
+
+
 class LogLevel:
     SILENT = 1
     INFO = 2
     DEBUG = 3
 
 
+# Level names of structured (JSON lines) events
+LOG_LEVEL_NAMES: dict[int, str] = {LogLevel.SILENT: 'SILENT', LogLevel.INFO: 'INFO', LogLevel.DEBUG: 'DEBUG'}
+
 class LogDisplay:
-    def __init__(self, app_log_level: int = LogLevel.SILENT, box_file_path: PurePath = None):
+    def __init__(self, app_log_level: int = LogLevel.SILENT, box_file_path: PurePath = None, structured: bool = False):
+        """
+        :param structured: print one JSON object per event (see jsonLogUtils.format_json_event) instead of coloured text
+        """
         self.app_log_level = app_log_level
-        if box_file_path is not None:
-            self.box_file_path = box_file_path
-        else:
-            from boxtools.data.access.fileAccess import get_box_path
-            self.box_file_path = get_box_path()
+        self.structured = structured
+        # Resolved on first access only: most instances are just used to call get_log_display()
+        self._box_file_path = box_file_path
 
-    def show_log(self, value, log_level: int = LogLevel.SILENT):
-        if log_level <= self.app_log_level:
-            print(value, flush=True)
-
-    def show_array(self, value: list, log_level: int = LogLevel.SILENT):
-        separator = ' | '
+    @property
+    def box_file_path(self) -> PurePath:
+        if self._box_file_path is None:
+            from boxtools.data.access.fileAccess import get_box_path
+            self._box_file_path = get_box_path()
+        return self._box_file_path
+
+    @box_file_path.setter
+    def box_file_path(self, box_file_path: PurePath):
+        self._box_file_path = box_file_path
+
+    def is_enabled(self, log_level: int) -> bool:
+        return log_level <= self.app_log_level
+
+    @staticmethod
+    def render(value, args: tuple = ()):
+        """
+        Deferred formatting: value can be a zero-arg callable, or a str.format template filled with args.
+        Only called once the log level check passed.
+        """
+        if callable(value):
+            return value()
+        if args:
+            return value.format(*args)
+        return value
+
+    # value: plain value, str.format template (filled with args), or zero-arg callable. See also show_color_log
+    def show_log(self, value, log_level: int = LogLevel.SILENT, *args):
         if log_level <= self.app_log_level:
-            from os import get_terminal_size
-            try:
-                t_size = get_terminal_size().columns
-            except OSError as oe:
-                self.show_debug_color_log(f'show_array - Error (using 200 as default value) :: \n{oe}')
-                t_size = 200
-            # calculate min-widths on all columns
-            column_widths: list[int] = []
-            for idx, row in enumerate(value):
-                if isinstance(row, list):
-                    for v in range(0, len(row)):
-                        str_len: int = len(row[v])
-                        if len(column_widths) <= v:
-                            column_widths.append(str_len)
-                        elif column_widths[v] < str_len:
-                            column_widths[v] = str_len
-
-            # Fix last column size so that it doesn't exceed terminal size
-            separators_space = (len(column_widths) - 1) * len(separator)
-            c_tot_space = sum(column_widths) + separators_space
-            if c_tot_space > t_size:
-                column_widths[-1] = column_widths[-1] - (c_tot_space - t_size)
-
-            # show result accordingly
-            for idx, row in enumerate(value):
-                if isinstance(row, list):
-                    row_str = row[0].ljust(column_widths[0])
-                    last_col_offset = 0
-                    for col in range(1, len(row)):
-                        # evaluate last column offset
-                        last_col_offset = len(row_str) + separators_space
-                        row_str += separator + row[col].ljust(column_widths[col])
-                    if len(row_str) > t_size:
-                        # Result is too long for terminal: split last column content on multiple lines
-                        rows = [row_str[i:i + t_size] for i in range(0, len(row_str), t_size)]
-                        print(rows[0], flush=True)
-                        for r in rows[1:]:
-                            print(' ' * last_col_offset + r, flush=True)
-                    else:
-                        print(row_str, flush=True)
-                    if idx == 0:
-                        print('-' * t_size, flush=True)
-                # single column result - basically not an array
-                else:
-                    if idx == 0:
-                        print(row, flush=True)
-                        print('-' * t_size, flush=True)
-                    print(row, flush=True)
+            if self.structured:
+                print(self.format_event(log_level, self.render(value, args)), flush=True)
+            else:
+                print(self.render(value, args), flush=True)
+
+    @staticmethod
+    def format_event(log_level: int, message, level_name: str = None) -> str:
+        """
+        :param level_name: event level, defaults to the name of log_level (see LOG_LEVEL_NAMES)
+        """
+        return format_json_event(level_name or LOG_LEVEL_NAMES.get(int(log_level), str(log_level)), message)
+
+    def show_array(self, value, log_level: int = LogLevel.SILENT, stream: TextIO = None, sample_size: int = None,
+                   chunk_size: int = TABLE_CHUNK_SIZE):
+        """
+        Print value as a table (first row being the header), in a single buffered write & flush.
+        :param value: list of rows (list[str]), or any iterable of rows (e.g. a generator)
+        :param stream: output stream, defaults to sys.stdout
+        :param sample_size: number of leading rows used to compute column widths.
+        Defaults to all rows for a list, TABLE_SAMPLE_SIZE rows for any other iterable (which is then streamed)
+        :param chunk_size: number of characters buffered before being written to stream
+        """
+        stream_table(value, logger=self, log_level=log_level, stream=stream, sample_size=sample_size,
+                     chunk_size=chunk_size)
+
+    def get_terminal_width(self, default: int = 200) -> int:
+        from os import get_terminal_size
+        try:
+            return get_terminal_size().columns
+        except OSError as oe:
+            self.show_debug_color_log('show_array - Error (using {} as default value) :: \n{}', default, oe)
+            return default
 
-    def show_info_log(self, value):
-        self.show_log(value, LogLevel.INFO)
+    def show_info_log(self, value, *args):
+        self.show_log(value, LogLevel.INFO, *args)
 
-    def show_debug_log(self, value):
-        self.show_log(value, LogLevel.DEBUG)
+    def show_debug_log(self, value, *args):
+        self.show_log(value, LogLevel.DEBUG, *args)
 
-    def show_color_log(self, color, value, level=LogLevel.SILENT, color_end=Color.END):
+    # Same order as show_log: value, level, then the value template args (after color_end)
+    def show_color_log(self, color, value, level=LogLevel.SILENT, color_end=Color.END, *args):
         if int(level) <= self.app_log_level:
-            print(color + value + color_end, flush=True)
+            if self.structured:
+                print(self.format_event(level, self.render(value, args)), flush=True)
+            else:
+                print(color + self.render(value, args) + color_end, flush=True)
 
-    def show_info_color_log(self, value):
-        self.show_color_log(Color.C_BG_BLUE_TXT + Color.C_PALE_WHITE_TXT + Color.EFFECT_ITALIC, value, LogLevel.INFO)
+    def show_info_color_log(self, value, *args):
+        self.show_color_log(Color.C_BG_BLUE_TXT + Color.C_PALE_WHITE_TXT + Color.EFFECT_ITALIC, value, LogLevel.INFO,
+                            Color.END, *args)
 
-    def show_debug_color_log(self, value):
-        self.show_color_log(Color.CYAN_BGD + Color.BLACK_TXT, value, LogLevel.DEBUG)
+    def show_debug_color_log(self, value, *args):
+        self.show_color_log(Color.CYAN_BGD + Color.BLACK_TXT, value, LogLevel.DEBUG, Color.END, *args)
 
-    def show_critical_log(self, value):
-        self.show_color_log(Color.RED_BGD + Color.LIGHT_GRAY_TXT, value)
+    def show_critical_log(self, value, *args):
+        if self.structured:
+            # Shown whatever the log level, but not a SILENT event
+            print(self.format_event(LogLevel.SILENT, self.render(value, args), 'CRITICAL'), flush=True)
+            return
+        self.show_color_log(Color.RED_BGD + Color.LIGHT_GRAY_TXT, value, LogLevel.SILENT, Color.END, *args)
 
-    def show_help_log(self, value):
-        self.show_color_log(Color.YELLOW_BGD + Color.FORCED_BLACK, value)
+    def show_help_log(self, value, *args):
+        self.show_color_log(Color.YELLOW_BGD + Color.FORCED_BLACK, value, LogLevel.SILENT, Color.END, *args)
 
-    def show_title_log(self, value):
-        self.show_color_log(Color.OK_GREEN, value, LogLevel.INFO)
+    def show_title_log(self, value, *args):
+        self.show_color_log(Color.OK_GREEN, value, LogLevel.INFO, Color.END, *args)
 
     # {1} MUST be user_input placeholder in feedback_text
     def show_input_feedback_log(self, feedback_text, user_input, log_level: int = LogLevel.SILENT):
-        self.show_log(feedback_text.replace('{1}', Color.OK_GREEN + user_input + Color.END), log_level)
+        if log_level <= self.app_log_level:
+            if self.structured:
+                self.show_log(feedback_text.replace('{1}', user_input), log_level)
+            else:
+                self.show_log(feedback_text.replace('{1}', Color.OK_GREEN + user_input + Color.END), log_level)
 
     # {1} MUST be user_input placeholder in feedback_text
     def show_info_input_feedback_log(self, feedback_text, user_input):
@@ -134,15 +171,257 @@ class LogDisplay:
         return self.app_log_level
 
     def get_log_display(self, app_ini_file: str = 'app.ini'):
-        if self.box_file_path is None:
+        return get_log_display(app_ini_file)
+
+
+class _LogDisplayCache:
+    """
+    Process-wide LogDisplay instances, one per app ini file, rebuilt only when that file changes (see FileStampCache)
+    """
+    def __init__(self):
+        self.override: LogDisplay | None = None
+        self.ini_paths: dict[str, str | None] = {}
+        self.displays = FileStampCache(self._load)
+        # LogDisplay of the ini files that don't exist (yet): loaded, and reported, once
+        self.missing: dict[str, LogDisplay] = {}
+
+    def get(self, app_ini_file: str) -> LogDisplay:
+        if self.override is not None:
+            return self.override
+        ini_path = self._get_ini_path(app_ini_file)
+        if ini_path is None:
             return LogDisplay(LogLevel.SILENT)
-        app_settings: Settings = Settings(get_box_config_ini_file_path(app_ini_file))
         try:
-            return LogDisplay(app_settings.get_int_setting('SETTINGS', 'LOG_LEVEL'))
-        except ParseException:
-            print('Invalid log level in app.ini. Defaulting to SILENT.')
+            return self.displays.get(ini_path)
+        except OSError:
+            if ini_path not in self.missing:
+                self.missing[ini_path] = self._load(ini_path)
+            return self.missing[ini_path]
+
+    def _get_ini_path(self, app_ini_file: str) -> str | None:
+        # The box path depends on the __main__ script only: resolve it once per ini file name
+        if app_ini_file not in self.ini_paths:
+            try:
+                self.ini_paths[app_ini_file] = str(get_box_config_ini_file_path(app_ini_file))
+            except (TypeError, ParseException):
+                self.ini_paths[app_ini_file] = None
+        return self.ini_paths[app_ini_file]
+
+    @staticmethod
+    def _load(ini_path: str) -> LogDisplay:
+        try:
+            settings = Settings(PurePath(ini_path))
+            structured = (settings.has_setting('SETTINGS', 'LOG_FORMAT')
+                          and settings.get_string_setting('SETTINGS', 'LOG_FORMAT').strip().lower() == 'json')
+            return LogDisplay(settings.get_int_setting('SETTINGS', 'LOG_LEVEL'), structured=structured)
+        except (ParseException, ValueError):
+            print(f'Invalid log level in {PurePath(ini_path).name}. Defaulting to SILENT.')
             return LogDisplay(LogLevel.SILENT)
 
+    def clear(self):
+        self.ini_paths.clear()
+        self.displays.invalidate()
+        self.missing.clear()
+
+
+_log_display_cache = _LogDisplayCache()
+
+
+def get_log_display(app_ini_file: str = 'app.ini') -> LogDisplay:
+    """
+    :return: the shared LogDisplay configured by SETTINGS.LOG_LEVEL of app_ini_file (SILENT if not available).
+    The ini file is only read again once it has changed.
+    """
+    return _log_display_cache.get(app_ini_file)
+
+
+def set_log_display_override(log_display: LogDisplay | None):
+    """
+    Force get_log_display() to return log_display (e.g. in unit tests). Use None to remove the override
+    """
+    _log_display_cache.override = log_display
+
+
+def clear_log_display_cache():
+    _log_display_cache.clear()
+
+
+def stream_table(rows: Iterable, logger: LogDisplay = None, file_path: str = None, header_lines: list[str] = None,
+                 log_level: int = LogLevel.SILENT, column_widths: list[int] = None, sample_size: int = None,
+                 col_size: int = 15, stream: TextIO = None, chunk_size: int = TABLE_CHUNK_SIZE):
+    """
+    Render a table (first row being the header) to the terminal and/or a file, in a single pass over rows.
+    Rows are consumed one at a time, so memory stays bounded whatever the number of rows.
+    :param rows: any iterable of rows (list[str]); single values are shown as single column rows
+    :param logger: terminal output (show_array layout, or one JSON event per row if structured), skipped if None or
+    if log_level is not enabled
+    :param file_path: file output (fixed col_size layout), skipped if None
+    :param header_lines: lines written before the table
+    :param column_widths: fixed terminal column widths. If None, computed from the first sample_size rows
+    (all rows for a list, TABLE_SAMPLE_SIZE rows for any other iterable)
+    :param col_size: file output column width
+    :param stream: terminal output stream, defaults to sys.stdout
+    :param chunk_size: number of characters buffered before being written to an output
+    """
+    if header_lines is None:
+        header_lines = []
+    terminal_format: _TerminalTableFormat | _JsonTableFormat | None = None
+    terminal_writer: _BufferedWriter | None = None
+    if logger is not None:
+        for line in header_lines:
+            logger.show_log(line, log_level)
+        if logger.is_enabled(log_level) and logger.structured:
+            # Columns don't need to be aligned: rows are not sampled
+            terminal_format = _JsonTableFormat(logger, log_level)
+            terminal_writer = _BufferedWriter(stream if stream is not None else sys.stdout, chunk_size)
+        elif logger.is_enabled(log_level):
+            if column_widths is None:
+                if sample_size is None and isinstance(rows, (list, tuple)):
+                    column_widths = _get_column_widths(rows)
+                else:
+                    rows_iterator = iter(rows)
+                    sample = list(islice(rows_iterator, sample_size if sample_size is not None else TABLE_SAMPLE_SIZE))
+                    column_widths = _get_column_widths(sample)
+                    rows = chain(sample, rows_iterator)
+            terminal_format = _TerminalTableFormat(column_widths, logger.get_terminal_width())
+            terminal_writer = _BufferedWriter(stream if stream is not None else sys.stdout, chunk_size)
+
+    with ExitStack() as exit_stack:
+        file_format: _FileTableFormat | None = None
+        file_writer: _BufferedWriter | None = None
+        if file_path is not None:
+            # Replaced only once every row is written: a failing row source leaves the previous file intact
+            file_stream = exit_stack.enter_context(atomic_open(file_path, 'w', encoding='utf-8'))
+            file_format = _FileTableFormat(col_size)
+            file_writer = _BufferedWriter(file_stream, chunk_size)
+            for line in header_lines:
+                file_writer.write(line if line.endswith('\n') else line + '\n')
+        if terminal_format is None and file_format is None:
+            return
+        for idx, row in enumerate(rows):
+            if terminal_format is not None:
+                terminal_format.write_row(idx, row, terminal_writer)
+            if file_format is not None:
+                file_format.write_row(idx, row, file_writer)
+        if terminal_writer is not None:
+            terminal_writer.flush()
+        if file_writer is not None:
+            file_writer.flush()
+
+
+def _get_column_widths(rows: Iterable) -> list[int]:
+    column_widths: list[int] = []
+    for row in rows:
+        if isinstance(row, list):
+            for v, str_len in enumerate(map(len, row)):
+                if v == len(column_widths):
+                    column_widths.append(str_len)
+                elif column_widths[v] < str_len:
+                    column_widths[v] = str_len
+    return column_widths
+
+
+class _BufferedWriter:
+    """
+    Write to stream in chunks of about chunk_size characters
+    """
+    def __init__(self, stream: TextIO, chunk_size: int = TABLE_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer: list[str] = []
+        self.buffered: int = 0
+
+    def write(self, text: str):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.chunk_size:
+            self.stream.write(''.join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write(''.join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+        self.stream.flush()
+
+
+class _TerminalTableFormat:
+    """
+    show_array layout: columns fitted to their content, last column wrapped on terminal width
+    """
+    def __init__(self, column_widths: list[int], t_size: int, separator: str = TABLE_SEPARATOR):
+        self.column_widths = list(column_widths)
+        self.nb_widths = len(self.column_widths)
+        self.t_size = t_size
+        self.separator = separator
+        # Fix last column size so that it doesn't exceed terminal size
+        self.separators_space = (self.nb_widths - 1) * len(separator)
+        c_tot_space = sum(self.column_widths) + self.separators_space
+        if c_tot_space > t_size:
+            self.column_widths[-1] = self.column_widths[-1] - (c_tot_space - t_size)
+        self.header_separator = '-' * t_size + '\n'
+
+    def write_row(self, idx: int, row, writer: _BufferedWriter):
+        t_size = self.t_size
+        if isinstance(row, list):
+            column_widths = self.column_widths
+            nb_widths = self.nb_widths
+            # rows streamed after the widths sample may have more columns than measured
+            row_str = (row[0] if len(row) > 0 else '').ljust(column_widths[0] if nb_widths > 0 else 0)
+            last_col_offset = 0
+            for col in range(1, len(row)):
+                # evaluate last column offset
+                last_col_offset = len(row_str) + self.separators_space
+                row_str += self.separator + row[col].ljust(column_widths[col] if col < nb_widths else 0)
+            if len(row_str) > t_size:
+                # Result is too long for terminal: split last column content on multiple lines
+                writer.write(row_str[0:t_size] + '\n')
+                padding = ' ' * last_col_offset
+                for i in range(t_size, len(row_str), t_size):
+                    writer.write(padding + row_str[i:i + t_size] + '\n')
+            else:
+                writer.write(row_str + '\n')
+            if idx == 0:
+                writer.write(self.header_separator)
+        # single column result - basically not an array
+        else:
+            if idx == 0:
+                writer.write(str(row) + '\n')
+                writer.write(self.header_separator)
+            writer.write(str(row) + '\n')
+
+
+class _JsonTableFormat:
+    """
+    Structured LogDisplay layout: one JSON event per row
+    """
+    def __init__(self, logger: LogDisplay, log_level: int):
+        self.logger = logger
+        self.log_level = log_level
+
+    def write_row(self, idx: int, row, writer: _BufferedWriter):
+        writer.write(self.logger.format_event(self.log_level, list(row) if isinstance(row, (list, tuple)) else row)
+                     + '\n')
+
+
+class _FileTableFormat:
+    """
+    print_str_array file layout: fixed size columns, centered header
+    """
+    def __init__(self, col_size: int = 15, separator: str = TABLE_SEPARATOR):
+        self.col_size = col_size
+        self.separator = separator
+
+    def write_row(self, idx: int, row, writer: _BufferedWriter):
+        if idx == 1:
+            nb_col: int = len(row)
+            separator_spaces: int = (nb_col - 1) * len(self.separator)
+            writer.write('-' * (self.col_size * nb_col + separator_spaces) + '\n')
+        line = self.separator.join([f"{y:{_get_padding(self.col_size, x, idx)}}" for x, y in enumerate(row)])
+        writer.write(line if line.endswith('\n') else line + '\n')
+
 
 def i_info_msg(message: str):
     return f'ℹ️ {message}'
@@ -162,34 +441,17 @@ def i_loading_msg(message: str):
 def i_gear_msg(message: str):
     return f'⚙️️ {message}'
 
-def print_str_array(str_lst: list[str] = None, a_str_lst: list[list[str]] = None, file_path: str = None,
+def print_str_array(str_lst: list[str] = None, a_str_lst: Iterable[list[str]] = None, file_path: str = None,
                     logger: LogDisplay = None):
+    """
+    Write str_lst lines followed by the a_str_lst table (any iterable of rows) to file_path and/or logger.
+    See stream_table.
+    """
     if str_lst is None:
         str_lst = []
     if a_str_lst is None:
         a_str_lst = [[]]
-    if file_path is not None:
-        concat_lst: list[str] = []
-        col_size: int = 15
-        if len(a_str_lst) > 0:
-            for i in range(len(a_str_lst)):
-                separator: str = ' | '
-                nb_col: int = len(a_str_lst[i])
-                separator_spaces: int = (nb_col - 1) * len(separator)
-                if i == 1:
-                    concat_lst.append('-' * (col_size * nb_col + separator_spaces) + '\n')
-                concat_lst.append(separator.join([f"{y:{_get_padding(col_size, x, i)}}" for x, y in enumerate(a_str_lst[i])]))
-        f_output = str_lst + concat_lst
-        for i in range(len(f_output)):
-            if not f_output[i].endswith('\n'):
-                f_output[i] += '\n'
-        write_to_file(file_path=file_path,
-                      content=f_output)
-
-    if logger is not None:
-        for line in str_lst:
-            logger.show_log(line)
-        logger.show_array(a_str_lst)
+    stream_table(a_str_lst, logger=logger, file_path=file_path, header_lines=str_lst)
 
 
 def _get_padding(col_size: int, column_id: int, line_id: int) -> str:
@@ -33,7 +33,7 @@ def show_debug_log(value):
 
 
 def show_color_log(color, value, level: int = LogLevel.SILENT, color_end=Color.END):
-    log_display.show_color_log(color, value, level, color_end)
+    log_display.show_color_log(color, value, level=level, color_end=color_end)
 
 
 def show_info_color_log(value):
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+class BulkSwapReportDto:
+    """
+    Result of a bulkSwapper run. Times are in seconds: io_time and match_time are summed over every file
+    (across worker processes), discovery_time and wall_time are elapsed times.
+    """
+    __slots__ = ('files_scanned', 'files_matched', 'changes', 'diffs', 'discovery_time', 'io_time', 'match_time',
+                 'wall_time', 'dry_run', 'errors')
+
+    def __init__(self, dry_run: bool = False):
+        self.files_scanned: int = 0
+        # files containing at least one rule key (byte level pre-filter)
+        self.files_matched: int = 0
+        # file path -> number of changed lines, for changed files only
+        self.changes: dict[str, int] = {}
+        # file path -> unified diff, in dry run mode only
+        self.diffs: dict[str, str] = {}
+        self.discovery_time: float = 0.0
+        self.io_time: float = 0.0
+        self.match_time: float = 0.0
+        self.wall_time: float = 0.0
+        self.dry_run: bool = dry_run
+        # file path -> error, for the files that couldn't be read (e.g. binary files) or written: they are skipped
+        self.errors: dict[str, str] = {}
+
+    def get_changed_line_count(self) -> int:
+        return sum(self.changes.values())
+
+    def __repr__(self):
+        return ('BulkSwapReportDto(files_scanned={}, files_matched={}, files_changed={}, lines_changed={}, errors={}, '
+                'discovery_time={:.3f}, io_time={:.3f}, match_time={:.3f}, wall_time={:.3f}, dry_run={})').format(
+            self.files_scanned, self.files_matched, len(self.changes), self.get_changed_line_count(), len(self.errors),
+            self.discovery_time, self.io_time, self.match_time, self.wall_time, self.dry_run)
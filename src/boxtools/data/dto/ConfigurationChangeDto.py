@@ -1,18 +1,38 @@
 #!/usr/bin/env python3
 
+from configparser import ConfigParser
 from pathlib import PurePath
 
 from boxtools.data.dto.PropertyDto import PropertyDto
 
 
 class ConfigurationChangeDto:
-    properties = []
-
     def __init__(self, configuration_file_path: PurePath):
         self.configuration_file_path = configuration_file_path
+        # (section, option) -> change: a later change of the same key replaces the previous one
+        self.properties: dict[tuple[str, str], PropertyDto] = {}
 
     def add_property_change(self, group_name: str, property_name: str, property_value: str):
-        self.properties.append(PropertyDto(group_name, property_name, property_value))
+        # Option names are case-insensitive in ConfigParser (lower-cased by optionxform)
+        self.properties[(group_name, property_name.lower())] = PropertyDto(group_name, property_name, property_value)
 
     def get_changes(self) -> list[PropertyDto]:
-        return self.properties
+        return list(self.properties.values())
+
+    def get_diff(self, current_config: ConfigParser) -> list[PropertyDto]:
+        """
+        :param current_config: the configuration the changes are meant to be applied on
+        :return: the changes whose value differs from current_config (missing sections/options included)
+        """
+        return [change for change in self.properties.values()
+                if current_config.get(change.property_group, change.property_name, raw=True, fallback=None)
+                != change.property_value]
+
+    def has_changes(self) -> bool:
+        return len(self.properties) > 0
+
+    def clear(self):
+        self.properties.clear()
+
+    def __len__(self):
+        return len(self.properties)
@@ -39,11 +39,11 @@ class HelpEntry:
             if self._is_array(self.help_entry_additional_information):
                 self.logger.show_debug_log('    --> additional info detected ')
                 for ai in self.help_entry_additional_information:
-                    self.logger.show_debug_log('    --> additional info: ' + ai)
+                    self.logger.show_debug_log('    --> additional info: {}', ai)
                     output += new_line()
                     output += indent + '  -> ' + ai
             else:
-                self.logger.show_debug_log('    --> additional info not detected ' + str(self.help_entry_additional_information))
+                self.logger.show_debug_log('    --> additional info not detected {}', self.help_entry_additional_information)
                 output += new_line()
                 output += indent + '  -> ' + str(self.help_entry_additional_information)
         #self.logger.show_debug_log('     ---> entry: \n ' + output + '\n')
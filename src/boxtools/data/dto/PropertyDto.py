@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
 class PropertyDto:
+    __slots__ = ('property_group', 'property_name', 'property_value')
+
     def __init__(self, property_group, property_name, property_value):
         self.property_group = property_group
         self.property_name = property_name
         self.property_value = property_value
+
+    def __repr__(self):
+        return 'PropertyDto({!r}, {!r}, {!r})'.format(self.property_group, self.property_name, self.property_value)
@@ -11,7 +11,7 @@ class SqlParser:
         self.logger: LogDisplay = LogDisplay().get_log_display()
 
     def parse(self, sql: str)->List[Statement]:
-        self.logger.show_debug_log(' - Parsing SQL: {}'.format(sql))
+        self.logger.show_debug_log(' - Parsing SQL: {}', sql)
         try:
             return sqlparse.parse(sql.strip())
         except TypeError as e:
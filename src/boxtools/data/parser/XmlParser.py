@@ -9,7 +9,7 @@ class XmlParser:
         self.logger: LogDisplay = LogDisplay().get_log_display()
 
     def parse(self, sql: str)-> Element | None:
-        self.logger.show_debug_log(' - Parsing SQL: {}'.format(sql))
+        self.logger.show_debug_log(' - Parsing SQL: {}', sql)
         try:
             return fromstring(sql.strip())
         except ParseError as e:
@@ -7,49 +7,98 @@ from typing import Any
 from boxtools.exception.Exceptions import ParseException
 
 from boxtools.data.dto.ConfigurationChangeDto import ConfigurationChangeDto
-
-
-def get_properties(conf_file_path: PurePath) -> configparser.ConfigParser:
+from boxtools.data.util.FileStampCache import FileStampCache
+from boxtools.data.util.fileUtils import atomic_open
+
+
+class _PropertiesCache(FileStampCache):
+    """
+    Process-wide cache of parsed ini files, see FileStampCache
+    """
+    def __init__(self):
+        super().__init__(_read_properties)
+
+    def get(self, conf_file_path: PurePath) -> configparser.ConfigParser:
+        try:
+            return super().get(conf_file_path)
+        except OSError:
+            # Missing file: ConfigParser.read() silently ignores it, so do we (but never cache it)
+            path: str = self.resolve(conf_file_path)
+            self.invalidate(path)
+            with self.lock:
+                self.misses += 1
+            return _read_properties(path)
+
+
+def _read_properties(conf_file_path: str) -> configparser.ConfigParser:
     config = configparser.ConfigParser()
-    config.read(str(conf_file_path))
+    config.read(conf_file_path)
     return config
 
 
-def get_string_property(conf_file_path: PurePath, property_group: str, property_name: str) -> str:
+_properties_cache = _PropertiesCache()
+
+
+# Cached ConfigParser instances are shared: treat them as read-only, or use use_cache=False to get a private copy
+def get_properties(conf_file_path: PurePath, use_cache: bool = True) -> configparser.ConfigParser:
+    if not use_cache:
+        return _read_properties(str(conf_file_path))
+    return _properties_cache.get(conf_file_path)
+
+
+def invalidate_properties_cache(conf_file_path: PurePath = None):
+    """
+    Drop the cached entry of conf_file_path, or every entry if no path is given
+    """
+    _properties_cache.invalidate(conf_file_path)
+
+
+def get_properties_cache_stats() -> dict[str, int]:
+    """
+    :return: {'hits': .., 'misses': .., 'entries': ..} of the process-wide properties cache
+    """
+    return _properties_cache.stats()
+
+
+def reset_properties_cache_stats():
+    _properties_cache.reset_stats()
+
+
+def get_string_property(conf_file_path: PurePath, property_group: str, property_name: str, use_cache: bool = True) -> str:
     try:
-        return get_properties(conf_file_path)[property_group][property_name]
+        return get_properties(conf_file_path, use_cache)[property_group][property_name]
     except KeyError as ke:
         raise ParseException('Failed to retrieve string property ' + property_name + ' of group ' + property_group) \
             from ke
 
 
-def get_boolean_property(conf_file_path: PurePath, property_group: str, property_name: str) -> bool:
+def get_boolean_property(conf_file_path: PurePath, property_group: str, property_name: str, use_cache: bool = True) -> bool:
     try:
-        return get_properties(conf_file_path)[property_group].getboolean(property_name)
+        return get_properties(conf_file_path, use_cache)[property_group].getboolean(property_name)
     except KeyError as ke:
         raise ParseException('Failed to retrieve boolean property ' + property_name + ' of group ' + property_group) \
             from ke
 
 
-def get_int_property(conf_file_path: PurePath, property_group: str, property_name: str) -> int:
+def get_int_property(conf_file_path: PurePath, property_group: str, property_name: str, use_cache: bool = True) -> int:
     try:
-        return get_properties(conf_file_path)[property_group].getint(property_name)
+        return get_properties(conf_file_path, use_cache)[property_group].getint(property_name)
     except KeyError as ke:
         raise ParseException('Failed to retrieve int property ' + property_name + ' of group ' + property_group) \
             from ke
 
 
-def get_float_property(conf_file_path: PurePath, property_group: str, property_name: str) -> float:
+def get_float_property(conf_file_path: PurePath, property_group: str, property_name: str, use_cache: bool = True) -> float:
     try:
-        return get_properties(conf_file_path)[property_group].getfloat(property_name)
+        return get_properties(conf_file_path, use_cache)[property_group].getfloat(property_name)
     except KeyError as ke:
         raise ParseException('Failed to retrieve float property ' + property_name + ' of group ' + property_group) \
             from ke
 
 
-def get_list_property(conf_file_path: PurePath, property_group: str, property_name: str) -> list[str] | list[Any]:
+def get_list_property(conf_file_path: PurePath, property_group: str, property_name: str, use_cache: bool = True) -> list[str] | list[Any]:
     try:
-        b_property: str = get_properties(conf_file_path)[property_group].get(property_name)
+        b_property: str = get_properties(conf_file_path, use_cache)[property_group].get(property_name)
         if b_property is None:
             return []
         return b_property.split(',')
@@ -59,9 +108,11 @@ def get_list_property(conf_file_path: PurePath, property_group: str, property_na
 
 
 # Use set_property instead if you have a single property to set
+# The file is replaced atomically: an interrupted write never leaves a half-written ini
 def set_properties(conf_file_path: PurePath, config):
-    with open(str(conf_file_path), 'w') as configfile:
+    with atomic_open(str(conf_file_path), 'w') as configfile:
         config.write(configfile)
+    invalidate_properties_cache(conf_file_path)
 
 
 def get_configuration_change(conf_file_path: PurePath) -> ConfigurationChangeDto:
@@ -70,12 +121,18 @@ def get_configuration_change(conf_file_path: PurePath) -> ConfigurationChangeDto
 
 # User should only use this one for save operations
 # Use get_configuration_change to retrieve initial object, then use its add_property_change method
-def apply_configuration_change(conf_file_path: PurePath, configuration_change: ConfigurationChangeDto):
-    properties = get_properties(conf_file_path)
-    for change in configuration_change.get_changes():
+# Returns False (and leaves the file untouched) when no change differs from the current file content
+def apply_configuration_change(conf_file_path: PurePath, configuration_change: ConfigurationChangeDto) -> bool:
+    # Private copy: the cached instance is shared with readers
+    properties = get_properties(conf_file_path, use_cache=False)
+    diff = configuration_change.get_diff(properties)
+    if len(diff) == 0:
+        return False
+    for change in diff:
         properties[change.property_group][change.property_name] = change.property_value
     set_properties(conf_file_path, properties)
+    return True
 
 
-def has_property(conf_file_path: PurePath, property_group: str, property_name: str):
-    return get_properties(conf_file_path).has_option(property_group, property_name)
+def has_property(conf_file_path: PurePath, property_group: str, property_name: str, use_cache: bool = True):
+    return get_properties(conf_file_path, use_cache).has_option(property_group, property_name)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import io
+from pathlib import PurePath
+
+from boxtools.data.util.fileUtils import atomic_open
+from boxtools.data.util.stringUtils import new_line
+
+
+class FileEditSession:
+    """
+    Many edits on one file, read once and written once (through atomic_open) on commit().
+    Line numbers always refer to the file as it was loaded: offsets introduced by earlier edits are resolved here.
+    Edits on a same line are applied in call order. Negative line numbers count from the end, as list indexes.
+
+    with FileEditSession(file_path) as session:
+        session.insert(3, 'import a.b.C;')
+        session.comment(10)
+    """
+    def __init__(self, file_path: str | PurePath):
+        self.file_path = file_path
+        with open(file_path, "r") as f:
+            self.lines: list[str] = f.readlines()
+        # original line number -> values inserted before it (len(lines): appended at the end)
+        self.inserts: dict[int, list[str]] = {}
+        # original line number -> edits (functions of the line), None for a deleted line
+        self.edits: dict[int, list | None] = {}
+        self.edit_count: int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def _resolve(self, line_number: int) -> int:
+        resolved = line_number + len(self.lines) if line_number < 0 else line_number
+        if not 0 <= resolved < len(self.lines):
+            raise IndexError('line number out of range: {}'.format(line_number))
+        return resolved
+
+    def _add_edit(self, line_number: int, edit):
+        edits = self.edits.setdefault(self._resolve(line_number), [])
+        if edits is not None:
+            edits.append(edit)
+            self.edit_count += 1
+
+    def find_lines(self, text: str, stop_on_first: bool = False) -> list[int]:
+        matches: list[int] = []
+        for line_number, line in enumerate(self.lines):
+            if text in line:
+                matches.append(line_number)
+                if stop_on_first:
+                    break
+        return matches
+
+    def insert(self, line_number: int, value: str, no_duplicate: bool = False):
+        """
+        Insert value as a new line before line_number (same as fileContentSwapper.add_line)
+        :param no_duplicate: skip if the line at line_number contains value
+        """
+        if no_duplicate and value in self.lines[self._resolve(line_number)]:
+            return
+        resolved = line_number + len(self.lines) if line_number < 0 else line_number
+        resolved = min(max(resolved, 0), len(self.lines))
+        self.inserts.setdefault(resolved, []).append(value + new_line())
+        self.edit_count += 1
+
+    def insert_before_text(self, matched_text: str, value: str, no_duplicate: bool = False):
+        """
+        Insert value before the first line containing matched_text
+        :param no_duplicate: skip if the previous line contains value
+        """
+        for line_number in self.find_lines(matched_text, stop_on_first=True):
+            if no_duplicate and value in self.lines[line_number - 1]:
+                return
+            self.insert(line_number, value)
+
+    def replace(self, line_number: int, value: str):
+        self._add_edit(line_number, lambda line: value + "\n")
+
+    def append(self, line_number: int, value: str, no_duplicate: bool = False):
+        # Same as fileContentSwapper.append_to_line: value goes after the line's new line character
+        self._add_edit(line_number, lambda line: line if no_duplicate and line.endswith(value) else line + value)
+
+    def prepend(self, line_numbers: list[int], value: str, no_duplicate: bool = False):
+        for line_number in line_numbers:
+            self._add_edit(line_number,
+                           lambda line: line if no_duplicate and line.startswith(value) else value + line)
+
+    def comment(self, line_number: int, comment_prefix: str = '//'):
+        self.prepend([line_number], comment_prefix, no_duplicate=True)
+
+    def comment_text(self, matched_text: str, match_cnt: int = -1, comment_prefix: str = '//'):
+        """
+        Same as JavaTools.comment_line_with_text (fileContentSwapper.prepend_to_line_by_text)
+        :param match_cnt: -1: comment the first line containing matched_text. If > 0, only the match_cnt-th one.
+        Otherwise (e.g. 0), every one
+        """
+        line_numbers: list[int] = self.find_lines(matched_text, stop_on_first=match_cnt == -1)
+        if match_cnt > 0:
+            line_numbers = line_numbers[match_cnt - 1:match_cnt]
+        self.prepend(line_numbers, comment_prefix, no_duplicate=True)
+
+    def delete(self, line_number: int):
+        line_number = self._resolve(line_number)
+        self.edits[line_number] = None
+        self.edit_count += 1
+
+    def has_changes(self) -> bool:
+        return self.edit_count > 0
+
+    def commit(self) -> bool:
+        """
+        Write every edit at once. The session can be reused afterwards, against the new content
+        :return: False if there was nothing to write
+        """
+        if not self.has_changes():
+            return False
+        new_lines: list[str] = []
+        for line_number, line in enumerate(self.lines):
+            new_lines.extend(self.inserts.get(line_number, ()))
+            if line_number in self.edits:
+                edits = self.edits[line_number]
+                if edits is None:
+                    continue
+                for edit in edits:
+                    line = edit(line)
+            new_lines.append(line)
+        new_lines.extend(self.inserts.get(len(self.lines), ()))
+        content: str = ''.join(new_lines)
+        with atomic_open(self.file_path, "w") as f:
+            f.write(content)
+        # Split the way readlines() does: on '\n' only (splitlines also splits on '\x0c', '\u2028'...)
+        self.lines = io.StringIO(content).readlines()
+        self.inserts = {}
+        self.edits = {}
+        self.edit_count = 0
+        return True
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+from threading import Lock
+
+from boxtools.data.util.fileUtils import atomic_open
+
+_CACHE_VERSION: int = 1
+
+
+def get_cache_dir() -> str:
+    """
+    :return: the per-user directory of the class index cache files ($XDG_CACHE_HOME/boxtools, or ~/.cache/boxtools)
+    """
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                        'boxtools')
+
+
+def _is_safe_entry(relative_dir: str, java_files: list[str], sub_dirs: list[str]) -> bool:
+    # Entries are built from directory entry names: anything leading out of the root is not ours
+    parts = relative_dir.split(os.sep) if relative_dir else []
+    names = parts + java_files + sub_dirs
+    return (not os.path.isabs(relative_dir)
+            and all(isinstance(name, str) and name not in ('', '.', '..') and os.sep not in name
+                    and (os.altsep is None or os.altsep not in name) for name in names))
+
+
+class JavaClassIndex:
+    """
+    Index of the .java files of a project: simple class name -> file paths.
+    Built with a single os.scandir walk (hidden entries skipped, symlinked directories followed, as glob does), then
+    refreshed incrementally: a directory whose mtime didn't change is not listed again. The index is persisted to
+    cache_file (JSON, in the per-user get_cache_dir() by default), so that the next process only stats the project
+    directories.
+    """
+    def __init__(self, project_path, cache_file: str = None):
+        self.project_path: str = os.fspath(project_path)
+        self.root: str = os.path.realpath(self.project_path)
+        if cache_file is None:
+            cache_file = os.path.join(get_cache_dir(), 'class-index-{}.json'.format(
+                hashlib.sha1(self.root.encode('utf-8')).hexdigest()[:16]))
+        self.cache_file: str = cache_file
+        # directory path relative to root -> (mtime_ns, .java file names, sub directory names)
+        self.dirs: dict[str, tuple[int, list[str], list[str]]] = {}
+        self.classes: dict[str, list[str]] = {}
+        self.lock = Lock()
+        self._load_cache()
+        self.refresh()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(cache, dict) or cache.get('version') != _CACHE_VERSION or cache.get('root') != self.root:
+            return
+        try:
+            dirs = {path: (int(entry[0]), list(entry[1]), list(entry[2])) for path, entry in cache['dirs'].items()}
+        except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+            return
+        # A cache pointing out of the project is ignored as a whole: the project is walked again
+        if all(_is_safe_entry(path, entry[1], entry[2]) for path, entry in dirs.items()):
+            self.dirs = dirs
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), mode=0o700, exist_ok=True)
+            with atomic_open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': _CACHE_VERSION, 'root': self.root,
+                           'dirs': {path: list(entry) for path, entry in self.dirs.items()}}, f)
+        except OSError:
+            # The index still works without its cache file
+            pass
+
+    def refresh(self) -> bool:
+        """
+        Walk the project again, only listing the directories changed since the last walk
+        :return: True if anything changed
+        """
+        with self.lock:
+            dirs: dict[str, tuple[int, list[str], list[str]]] = {}
+            changed: bool = False
+            pending: list[str] = ['']
+            # (device, inode) of the directories walked: a symlink loop is only walked once
+            visited: set[tuple[int, int]] = set()
+            while pending:
+                relative_dir = pending.pop()
+                directory = os.path.join(self.root, relative_dir) if relative_dir else self.root
+                try:
+                    st = os.stat(directory)
+                except OSError:
+                    changed = True
+                    continue
+                if (st.st_dev, st.st_ino) in visited:
+                    continue
+                visited.add((st.st_dev, st.st_ino))
+                mtime_ns = st.st_mtime_ns
+                entry = self.dirs.get(relative_dir)
+                if entry is None or entry[0] != mtime_ns:
+                    entry = self._list_dir(directory, mtime_ns)
+                    changed = True
+                dirs[relative_dir] = entry
+                pending.extend(os.path.join(relative_dir, sub_dir) for sub_dir in entry[2])
+            if changed or len(dirs) != len(self.dirs):
+                self.dirs = dirs
+                self._save_cache()
+                changed = True
+            if changed or not self.classes:
+                self._index_classes()
+            return changed
+
+    @staticmethod
+    def _list_dir(directory: str, mtime_ns: int) -> tuple[int, list[str], list[str]]:
+        java_files: list[str] = []
+        sub_dirs: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        sub_dirs.append(entry.name)
+                    elif entry.name.endswith('.java'):
+                        java_files.append(entry.name)
+        except OSError:
+            pass
+        return mtime_ns, java_files, sub_dirs
+
+    def _index_classes(self):
+        classes: dict[str, list[str]] = {}
+        for relative_dir, (_, java_files, _) in self.dirs.items():
+            for java_file in java_files:
+                classes.setdefault(java_file[:-5], []).append(os.path.join(self.project_path, relative_dir, java_file)
+                                                              if relative_dir else
+                                                              os.path.join(self.project_path, java_file))
+        for paths in classes.values():
+            paths.sort()
+        self.classes = classes
+
+    def find_all(self, class_name: str) -> list[str]:
+        """
+        :param class_name: simple class name, with or without .java
+        :return: paths of the matching files. The index is refreshed first if none is found, or if one was deleted
+        """
+        name = class_name[:-5] if class_name.endswith('.java') else class_name
+        paths = self.classes.get(name)
+        if not paths or not all(os.path.exists(path) for path in paths):
+            self.refresh()
+            paths = self.classes.get(name)
+        return list(paths) if paths else []
+
+    def find(self, class_name: str) -> str | None:
+        paths = self.find_all(class_name)
+        return paths[0] if paths else None
+
+    def find_by_fqcn(self, fqcn: str) -> str | None:
+        """
+        :param fqcn: fully qualified class name, e.g. com.company.Entity
+        :return: path of the class file whose package declaration matches
+        """
+        from boxtools.data.swapper.javaTools import JavaTools
+        package, _, name = fqcn.rpartition('.')
+        paths = self.find_all(name)
+        # Files usually sit in their package directories: check those first
+        package_dir_suffix = os.sep + package.replace('.', os.sep) + os.sep + name + '.java'
+        for path in sorted(paths, key=lambda candidate: not candidate.endswith(package_dir_suffix)):
+            if (JavaTools.get_java_class_package_value(path) or '') == package:
+                return path
+        return None
+
+
+_java_class_indexes: dict[str, JavaClassIndex] = {}
+_java_class_indexes_lock = Lock()
+
+
+def get_java_class_index(project_path) -> JavaClassIndex:
+    """
+    :return: the process-wide JavaClassIndex of project_path (built, or loaded from its cache file, on first call)
+    """
+    key: str = os.fspath(project_path)
+    with _java_class_indexes_lock:
+        index = _java_class_indexes.get(key)
+        if index is None:
+            index = JavaClassIndex(project_path)
+            _java_class_indexes[key] = index
+    return index
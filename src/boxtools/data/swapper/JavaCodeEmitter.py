@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+from functools import lru_cache
+
+from boxtools.data.util.stringUtils import upper_first_letter, new_line
+
+_collection_prefixes: tuple[str, ...] = ('List', 'Set', 'Map')
+
+
+class AccessorTemplates:
+    """
+    Lines of getters/setters/constructors for one indent level, with their indentation already applied.
+    Property names and classes are filled in with str.format
+    """
+    __slots__ = ('indent', 'override', 'getter', 'getter_body', 'setter', 'setter_body', 'content', 'read_only',
+                 'constructor', 'close', 'constructor_close')
+
+    def __init__(self, indent: str, indent_count: int):
+        prefix: str = indent * indent_count
+        body_prefix: str = indent * (indent_count + 1)
+        line_break: str = new_line()
+        self.indent: str = indent
+        self.override: str = prefix + '@Override' + line_break
+        self.getter: str = prefix + 'public {0} get{1}() {{ ' + line_break
+        self.getter_body: str = body_prefix + 'return {0}; ' + line_break
+        self.setter: str = prefix + 'public void set{1}({0} {2}) {{ ' + line_break
+        self.setter_body: str = body_prefix + 'this.{0} = {0}; ' + line_break
+        self.content: str = body_prefix + '{0}' + line_break
+        self.read_only: str = prefix + '@Schema(accessMode = Schema.AccessMode.READ_ONLY)' + line_break
+        self.constructor: str = prefix + 'public {0}({1}) {{' + line_break
+        self.close: str = prefix + '} ' + line_break
+        self.constructor_close: str = prefix + '}' + line_break
+
+
+@lru_cache(maxsize=None)
+def get_accessor_templates(indent: str, indent_count: int) -> AccessorTemplates:
+    return AccessorTemplates(indent, indent_count)
+
+
+def emit_getter(templates: AccessorTemplates, property_name: str, property_class: str, to_list: list,
+                add_override: bool = True, date_format: str | None = None, seen: set[str] = None):
+    """
+    :param seen: getter/setter declaration lines already in to_list, checked instead of to_list itself (and updated)
+    """
+    getter_line = templates.getter.format(property_class, upper_first_letter(property_name))
+    if getter_line in (to_list if seen is None else seen):
+        return
+    if seen is not None:
+        seen.add(getter_line)
+    if date_format is not None:
+        to_list.append(templates.indent + date_format + new_line())
+    if add_override:
+        to_list.append(templates.override)
+    to_list.append(getter_line)
+    to_list.append(templates.getter_body.format(property_name))
+    to_list.append(templates.close)
+    to_list.append(new_line())
+
+
+def emit_setter(templates: AccessorTemplates, property_name: str, property_class: str, to_list: list,
+                add_override: bool = True, optional_content: str = None, seen: set[str] = None):
+    """
+    :param seen: see emit_getter
+    """
+    setter_line = templates.setter.format(property_class, upper_first_letter(property_name), property_name)
+    if setter_line in (to_list if seen is None else seen):
+        if add_override:
+            to_list.append(new_line())
+            to_list.append(templates.override)
+        return
+    if seen is not None:
+        seen.add(setter_line)
+    if add_override:
+        to_list.append(templates.override)
+    if property_class and property_class.startswith(_collection_prefixes):
+        to_list.append(templates.read_only)
+    to_list.append(setter_line)
+    to_list.append(templates.setter_body.format(property_name))
+    if optional_content is not None:
+        to_list.append(templates.content.format(optional_content))
+    to_list.append(templates.close)
+    to_list.append(new_line())
+
+
+def emit_constructor(templates: AccessorTemplates, class_name: str, to_list: list,
+                     optional_parameter_content: str = None, optional_content: str = None):
+    to_list.append(templates.constructor.format(upper_first_letter(class_name),
+                                                optional_parameter_content if optional_parameter_content is not None
+                                                else ''))
+    if optional_content is not None:
+        to_list.append(templates.content.format(optional_content))
+    to_list.append(templates.constructor_close)
+    to_list.append(new_line())
+
+
+class JavaCodeEmitter:
+    """
+    Buffer of generated class members: same output as JavaTools.add_getter/add_setter/add_constructor, with
+    templates compiled once per indent level and duplicates found in a set instead of scanning the emitted lines.
+    """
+    def __init__(self, indent_count: int = 1, indent: str = '    '):
+        self.templates: AccessorTemplates = get_accessor_templates(indent, indent_count)
+        self.lines: list[str] = []
+        # getter/setter declaration lines already emitted
+        self.seen: set[str] = set()
+
+    def add_getter(self, property_name: str, property_class: str, add_override: bool = True,
+                   date_format: str | None = None) -> 'JavaCodeEmitter':
+        emit_getter(self.templates, property_name, property_class, self.lines, add_override, date_format, self.seen)
+        return self
+
+    def add_setter(self, property_name: str, property_class: str, add_override: bool = True,
+                   optional_content: str = None) -> 'JavaCodeEmitter':
+        emit_setter(self.templates, property_name, property_class, self.lines, add_override, optional_content,
+                    self.seen)
+        return self
+
+    def add_constructor(self, class_name: str, optional_parameter_content: str = None,
+                        optional_content: str = None) -> 'JavaCodeEmitter':
+        emit_constructor(self.templates, class_name, self.lines, optional_parameter_content, optional_content)
+        return self
+
+    def add_accessors(self, fields, add_override: bool = True) -> 'JavaCodeEmitter':
+        """
+        :param fields: (property name, property class) pairs, or a property name -> property class dict.
+        A getter then a setter is emitted for each one
+        """
+        for property_name, property_class in (fields.items() if isinstance(fields, dict) else fields):
+            self.add_getter(property_name, property_class, add_override)
+            self.add_setter(property_name, property_class, add_override)
+        return self
+
+    def getvalue(self) -> str:
+        return ''.join(self.lines)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+import os
+import re
+
+from boxtools.data.util.FileStampCache import FileStampCache
+
+# Characters read at once: most headers (package, imports, annotations, declaration) fit in one chunk
+HEADER_CHUNK_SIZE: int = 8 * 1024
+
+_declaration_pattern = re.compile(r'(?<![\w.])(@interface|class|interface|enum|record)\s+([A-Za-z_$][\w$]*)')
+_package_pattern = re.compile(r'(?<![\w.])package\s+([\w.]+)\s*;')
+_import_pattern = re.compile(r'(?<![\w.])import\s+(static\s+)?([\w.]+(?:\.\*)?)\s*;')
+_annotation_pattern = re.compile(r'@(?!interface\b)[\w.]+(?:\s*\([^()]*\))?')
+_generics_pattern = re.compile(r'<[^<>]*>')
+_parameters_pattern = re.compile(r'\([^()]*\)')
+
+
+class JavaHeader:
+    """
+    Declarations of a .java file up to its first type declaration: package, imports, and the type itself.
+    lines: raw lines of the file, up to the one holding the type declaration opening brace.
+    """
+    __slots__ = ('path', 'package', 'imports', 'class_name', 'kind', 'modifiers', 'superclass', 'interfaces',
+                 'lines')
+
+    def __init__(self, path: str, package: str | None, imports: list[str], class_name: str | None, kind: str | None,
+                 modifiers: list[str], superclass: str | None, interfaces: list[str], lines: list[str]):
+        self.path = path
+        self.package = package
+        # 'a.b.C', 'a.b.*', 'static a.b.C.method'
+        self.imports = imports
+        self.class_name = class_name
+        # 'class', 'interface', 'enum', 'record', '@interface', or None if no type declaration was found
+        self.kind = kind
+        self.modifiers = modifiers
+        # as written, without type arguments: 'Base', 'com.company.Base'
+        self.superclass = superclass
+        # implemented interfaces (extended ones for an interface), without type arguments
+        self.interfaces = interfaces
+        self.lines = lines
+
+    @property
+    def is_abstract(self) -> bool:
+        return 'abstract' in self.modifiers
+
+    @property
+    def is_concrete_class(self) -> bool:
+        return self.kind == 'class' and not self.is_abstract
+
+    @property
+    def fqcn(self) -> str | None:
+        if self.class_name is None:
+            return None
+        return self.package + '.' + self.class_name if self.package else self.class_name
+
+    def __repr__(self):
+        return 'JavaHeader({!r}, kind={!r}, superclass={!r}, interfaces={!r})'.format(
+            self.fqcn, self.kind, self.superclass, self.interfaces)
+
+
+def _strip_comments(line: str, in_block_comment: bool) -> tuple[str, bool]:
+    """
+    :return: the code of line (comments removed, string literals kept), and whether a block comment is left open
+    """
+    code: list[str] = []
+    i: int = 0
+    length: int = len(line)
+    while i < length:
+        if in_block_comment:
+            end = line.find('*/', i)
+            if end < 0:
+                return ''.join(code), True
+            in_block_comment = False
+            i = end + 2
+            code.append(' ')
+            continue
+        char = line[i]
+        if char == '"' or char == "'":
+            end = i + 1
+            while end < length and line[end] != char:
+                end += 2 if line[end] == '\\' else 1
+            code.append(line[i:end + 1])
+            i = end + 1
+        elif char == '/' and line.startswith('//', i):
+            break
+        elif char == '/' and line.startswith('/*', i):
+            in_block_comment = True
+            i += 2
+        else:
+            code.append(char)
+            i += 1
+    return ''.join(code), in_block_comment
+
+
+def _split_types(types: str) -> list[str]:
+    return [name.strip() for name in types.split(',') if name.strip()]
+
+
+def _parse_header(path: str, code: str, lines: list[str]) -> JavaHeader:
+    package_match = _package_pattern.search(code)
+    imports: list[str] = [(('static ' if match.group(1) else '') + match.group(2))
+                          for match in _import_pattern.finditer(code)]
+    stripped_code = _annotation_pattern.sub(' ', code)
+    declaration = _declaration_pattern.search(stripped_code)
+    class_name = kind = superclass = None
+    modifiers: list[str] = []
+    interfaces: list[str] = []
+    if declaration is not None:
+        kind = declaration.group(1)
+        class_name = declaration.group(2)
+        # modifiers: words between the previous statement and the type keyword
+        prefix = re.split(r'[;}]', stripped_code[:declaration.start()])[-1]
+        modifiers = prefix.split()
+        tail = stripped_code[declaration.end():].split('{', 1)[0]
+        # remove type parameters/arguments (nested ones first) and record components
+        previous = None
+        while previous != tail:
+            previous = tail
+            tail = _generics_pattern.sub('', tail)
+        tail = _parameters_pattern.sub(' ', tail)
+        clauses = re.split(r'\b(extends|implements|permits)\b', tail)
+        for keyword, types in zip(clauses[1::2], clauses[2::2]):
+            if keyword == 'extends' and kind == 'class':
+                names = _split_types(types)
+                superclass = names[0] if names else None
+            elif keyword == 'implements' or (keyword == 'extends' and kind == 'interface'):
+                interfaces.extend(_split_types(types))
+    return JavaHeader(path, package_match.group(1) if package_match else None, imports, class_name, kind, modifiers,
+                      superclass, interfaces, lines)
+
+
+def read_java_header(file_path, chunk_size: int = HEADER_CHUNK_SIZE) -> JavaHeader:
+    """
+    Read file_path by chunks of chunk_size characters, only up to the opening brace of its first type declaration
+    """
+    path: str = os.fspath(file_path)
+    lines: list[str] = []
+    code_lines: list[str] = []
+    in_block_comment: bool = False
+    declared: bool = False
+    with open(path, 'r') as f:
+        pending: str = ''
+        while True:
+            chunk = f.read(chunk_size)
+            # only complete lines, unless the file is over
+            parts = (pending + chunk).split('\n')
+            pending = parts.pop()
+            complete_lines = [part + '\n' for part in parts]
+            if not chunk and pending:
+                complete_lines.append(pending)
+            for line in complete_lines:
+                lines.append(line)
+                code, in_block_comment = _strip_comments(line.rstrip('\n'), in_block_comment)
+                code_lines.append(code)
+                if not declared and _declaration_pattern.search(_annotation_pattern.sub(' ', code)):
+                    declared = True
+                if declared and '{' in code:
+                    return _parse_header(path, '\n'.join(code_lines), lines)
+            if not chunk:
+                return _parse_header(path, '\n'.join(code_lines), lines)
+
+
+# Process-wide JavaHeader records, read again only when the file changes. Their path is the resolved one
+_java_header_cache = FileStampCache(read_java_header)
+
+
+def get_java_header(file_path) -> JavaHeader:
+    """
+    :return: the JavaHeader of file_path, cached until the file changes (shared: don't modify it). Its path is
+    file_path resolved (realpath), whatever alias or symlink it was looked up with
+    """
+    return _java_header_cache.get(file_path)
+
+
+def clear_java_header_cache():
+    _java_header_cache.invalidate()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from multiprocessing import Pool
+
+from boxtools.Logs import LogDisplay
+from boxtools.data.swapper.JavaHeader import JavaHeader, read_java_header
+from boxtools.data.swapper.bulkSwapper import find_files, POOL_MIN_FILES, get_pool_chunk_size
+
+
+def _read_header(file_path: str) -> JavaHeader | None:
+    try:
+        header = read_java_header(file_path)
+    except (OSError, UnicodeDecodeError):
+        return None
+    # raw lines are not needed here: don't send them back to the parent process
+    header.lines = []
+    return header
+
+
+class JavaHierarchy:
+    """
+    extends/implements graph of the types declared under a source root, built from the file headers
+    (see JavaHeader) in a process pool.
+    Types are identified by their fully qualified name. Supertypes declared outside the source root (e.g.
+    Serializable) are kept as written, when they can't be resolved through the imports.
+    """
+    def __init__(self, headers: list[JavaHeader]):
+        self.headers: dict[str, JavaHeader] = {}
+        # simple name -> fully qualified names
+        self.simple_names: dict[str, list[str]] = {}
+        for header in headers:
+            if header is not None and header.fqcn is not None and header.fqcn not in self.headers:
+                self.headers[header.fqcn] = header
+                self.simple_names.setdefault(header.class_name, []).append(header.fqcn)
+        self.parents: dict[str, list[str]] = {}
+        self.children: dict[str, list[str]] = {}
+        for fqcn, header in self.headers.items():
+            supertypes = ([header.superclass] if header.superclass else []) + header.interfaces
+            parents = [self._resolve(header, supertype) for supertype in supertypes]
+            self.parents[fqcn] = parents
+            for parent in parents:
+                self.children.setdefault(parent, []).append(fqcn)
+
+    @classmethod
+    def build(cls, source_root, processes: int = None) -> 'JavaHierarchy':
+        """
+        :param processes: size of the process pool, defaults to the number of CPUs. 1 to stay in process
+        """
+        logger: LogDisplay = LogDisplay().get_log_display()
+        files: list[str] = find_files(source_root, ['*.java'], ['.*'])
+        logger.show_debug_log(' - java hierarchy: scanning {} files', len(files))
+        if processes == 1 or len(files) < POOL_MIN_FILES:
+            headers = [_read_header(file_path) for file_path in files]
+        else:
+            with Pool(processes) as pool:
+                headers = pool.map(_read_header, files, chunksize=get_pool_chunk_size(len(files), processes))
+        return cls(headers)
+
+    def _resolve(self, header: JavaHeader, name: str) -> str:
+        if name in self.headers:
+            return name
+        first_part, _, rest = name.partition('.')
+        # Outer.Inner or a simple name: resolved from the first part, in Java's order: single-type imports, then
+        # types of the same package, then on-demand (wildcard) imports
+        candidates: list[str] = [imported for imported in header.imports
+                                 if imported.endswith('.' + first_part) and not imported.startswith('static ')]
+        if header.package:
+            candidates.append(header.package + '.' + first_part)
+        candidates.extend(imported[:-1] + first_part for imported in header.imports
+                          if imported.endswith('.*') and not imported.startswith('static '))
+        for candidate in candidates:
+            fqcn = candidate + '.' + rest if rest else candidate
+            if fqcn in self.headers:
+                return fqcn
+        # explicit import of an external type: use its full name
+        for imported in header.imports:
+            if imported.endswith('.' + first_part) and not imported.startswith('static '):
+                return imported + '.' + rest if rest else imported
+        return name
+
+    def get_fqcn(self, name: str) -> str:
+        """
+        :param name: fully qualified name, or simple name of a type declared once under the source root
+        """
+        if name in self.headers or name in self.children:
+            return name
+        fqcns = self.simple_names.get(name)
+        if fqcns is not None and len(fqcns) == 1:
+            return fqcns[0]
+        return name
+
+    def get_header(self, name: str) -> JavaHeader | None:
+        return self.headers.get(self.get_fqcn(name))
+
+    def _walk(self, name: str, edges: dict[str, list[str]]) -> list[str]:
+        # breadth first: closest types first, each one once
+        start = self.get_fqcn(name)
+        seen: set[str] = {start}
+        result: list[str] = []
+        queue = deque(edges.get(start, ()))
+        while queue:
+            fqcn = queue.popleft()
+            if fqcn in seen:
+                continue
+            seen.add(fqcn)
+            result.append(fqcn)
+            queue.extend(edges.get(fqcn, ()))
+        return result
+
+    def get_ancestors(self, name: str) -> list[str]:
+        """
+        :return: superclasses and implemented interfaces of name, direct or not
+        """
+        return self._walk(name, self.parents)
+
+    def get_descendants(self, name: str) -> list[str]:
+        """
+        :return: the types extending or implementing name, directly or not
+        """
+        return self._walk(name, self.children)
+
+    def get_concrete_subclasses(self, name: str) -> list[str]:
+        """
+        :return: the non-abstract classes among the descendants of name
+        """
+        return [fqcn for fqcn in self.get_descendants(name) if self.headers[fqcn].is_concrete_class]
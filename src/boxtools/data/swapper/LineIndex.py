@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, islice, repeat
+from operator import add
+
+from boxtools.data.util.FileStampCache import FileStampCache
+
+# Bytes read at once, to build an index or to copy unchanged parts of a file
+CHUNK_SIZE: int = 16 * 1024 * 1024
+
+
+class LineIndex:
+    """
+    Byte offsets of the '\\n' characters of a file (array('Q')): the byte range of any line is found in O(1).
+    Line numbers are the ones of a text mode reading, as long as the file has no '\\r' (see has_cr).
+    """
+    def __init__(self, newlines: array, size: int, has_cr: bool):
+        self.newlines: array = newlines
+        self.size: int = size
+        self.has_cr: bool = has_cr
+
+    @classmethod
+    def build(cls, file_path: str) -> 'LineIndex':
+        newlines = array('Q')
+        has_cr: bool = False
+        with open(file_path, 'rb') as f:
+            base: int = 0
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                has_cr = has_cr or b'\r' in chunk
+                # newline i is at base + sum(len(part) + 1 for the parts up to i) - 1: accumulated in C
+                parts = chunk.split(b'\n')
+                newlines.extend(islice(accumulate(map(add, map(len, parts[:-1]), repeat(1)), initial=base - 1),
+                                       1, None))
+                base += len(chunk)
+        return cls(newlines, base, has_cr)
+
+    def splice(self, splices: list[tuple[int, int, bytes]]) -> 'LineIndex':
+        """
+        :param splices: (start, end, data) byte ranges replaced by data, sorted and not overlapping
+        :return: the index of the spliced file, without rescanning it
+        """
+        newlines = array('Q')
+        position: int = 0
+        delta: int = 0
+        for start, end, data in splices:
+            newlines.extend(self._shift(position, start, delta))
+            base = start + delta
+            offset = data.find(b'\n')
+            while offset >= 0:
+                newlines.append(base + offset)
+                offset = data.find(b'\n', offset + 1)
+            delta += len(data) - (end - start)
+            position = end
+        newlines.extend(self._shift(position, self.size, delta))
+        return LineIndex(newlines, self.size + delta, self.has_cr)
+
+    def _shift(self, start: int, end: int, delta: int):
+        # newlines in [start, end), moved by delta
+        segment = self.newlines[bisect_left(self.newlines, start):bisect_left(self.newlines, end)]
+        return segment if delta == 0 else map(add, segment, repeat(delta))
+
+    def get_line_count(self) -> int:
+        last_line_start = self.newlines[-1] + 1 if self.newlines else 0
+        return len(self.newlines) + (1 if self.size > last_line_start else 0)
+
+    def get_line_start(self, line_number: int) -> int:
+        return self.newlines[line_number - 1] + 1 if line_number > 0 else 0
+
+    def get_line_end(self, line_number: int) -> int:
+        """
+        :return: offset following the line's '\\n' (the file size for a last line without one)
+        """
+        return self.newlines[line_number] + 1 if line_number < len(self.newlines) else self.size
+
+
+# Process-wide line indexes, rebuilt only when the file changes
+_line_index_cache = FileStampCache(LineIndex.build)
+
+
+def get_line_index(file_path) -> LineIndex:
+    return _line_index_cache.get(file_path)
+
+
+def put_line_index(file_path, line_index: LineIndex):
+    """
+    Store the index of a file just written
+    """
+    _line_index_cache.put(file_path, line_index)
+
+
+def invalidate_line_index(file_path=None):
+    _line_index_cache.invalidate(file_path)
+
+
+def copy_range(src, dst, length: int):
+    """
+    Copy length bytes from the current position of src to dst, CHUNK_SIZE at a time
+    """
+    while length > 0:
+        chunk = src.read(min(length, CHUNK_SIZE))
+        if not chunk:
+            break
+        dst.write(chunk)
+        length -= len(chunk)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+import os
+import re
+from difflib import unified_diff
+from fnmatch import fnmatch
+from multiprocessing import Pool
+from time import perf_counter
+from typing import Callable
+
+from boxtools.Logs import LogDisplay
+from boxtools.data.dto.BulkSwapReportDto import BulkSwapReportDto
+from boxtools.data.swapper.fileContentSwapper import ReplaceRuleSet, expand_tabs_in_file, compile_texts_pattern, \
+    _BYTE_SCAN_ENCODINGS, _get_text_encoding
+from boxtools.data.util.fileUtils import atomic_open
+import boxtools.env.environment
+
+# Below this number of candidate files, a process pool costs more than it saves
+POOL_MIN_FILES: int = 32
+
+
+class _LineRemover:
+    """
+    Same interface as ReplaceRuleSet for remove_lines_by_content: removed lines become ''
+    """
+    def __init__(self, texts: list[str]):
+        self.needles: set[str] = set(texts)
+        self.pattern = compile_texts_pattern(self.needles)
+
+    def apply(self, line: str, if_not_exist: bool = False, is_append: bool = False, line_break: str = None) -> str:
+        if self.pattern is None or (self.pattern is not False and self.pattern.search(line) is not None):
+            return ''
+        return line
+
+
+def find_files(root_path, includes: list[str] = None, excludes: list[str] = None, ignore_case: bool = False,
+               onerror: Callable[[OSError], None] = None) -> list[str]:
+    """
+    Walk root_path with os.scandir (symlinks are not followed)
+    :param root_path: directory to walk, or a single file (returned if it matches, as find does)
+    :param includes: glob patterns (fnmatch) a file name or path relative to root_path must match. Defaults to all
+    :param excludes: glob patterns of the files and directories to skip, matched the same way
+    :param ignore_case: match patterns case-insensitively (as find -iname)
+    :param onerror: called with the OSError of a directory that can't be listed (e.g. permission denied), which is
+    then skipped, as os.walk does. Ignored if None
+    :return: paths of the matching files, sorted
+    """
+    root_path = os.fspath(root_path)
+    excludes = excludes or []
+    if ignore_case:
+        includes = [pattern.lower() for pattern in includes] if includes else includes
+        excludes = [pattern.lower() for pattern in excludes]
+
+    def is_match(name: str, relative_path: str, patterns: list[str]) -> bool:
+        if ignore_case:
+            name = name.lower()
+            relative_path = relative_path.lower()
+        return any(fnmatch(name, pattern) or fnmatch(relative_path, pattern) for pattern in patterns)
+
+    if not os.path.isdir(root_path):
+        name = os.path.basename(root_path)
+        if os.path.isfile(root_path) and not is_match(name, name, excludes) and (
+                not includes or is_match(name, name, includes)):
+            return [root_path]
+        return []
+    files: list[str] = []
+    directories: list[str] = [root_path]
+    while directories:
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    relative_path = os.path.relpath(entry.path, root_path)
+                    if is_match(entry.name, relative_path, excludes):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and (
+                            not includes or is_match(entry.name, relative_path, includes)):
+                        files.append(entry.path)
+        except OSError as e:
+            if onerror is not None:
+                onerror(e)
+    files.sort()
+    return files
+
+
+def _error_recorder(errors: dict[str, str]) -> Callable[[OSError], None]:
+    # find_files onerror handler: path -> error
+    def record(error: OSError):
+        errors[os.fspath(error.filename)] = repr(error)
+    return record
+
+
+def _compile_byte_pattern(needles: set[str], encoding: str) -> re.Pattern[bytes] | None:
+    """
+    :param encoding: text encoding files are read with
+    :return: None if every file may change, or if files can't be pre-filtered on bytes in encoding
+    """
+    if not needles or '' in needles or encoding not in _BYTE_SCAN_ENCODINGS:
+        return None
+    try:
+        return re.compile(b'|'.join(re.escape(needle.encode(encoding)) for needle in needles))
+    except UnicodeEncodeError:
+        return None
+
+
+def _swap_file(file_path: str, editor, byte_pattern: re.Pattern[bytes] | None, if_not_exist: bool, is_append: bool,
+               line_break: str, dry_run: bool) -> tuple[str, bool, int, str | None, float, float, str | None]:
+    """
+    :return: file_path, pre-filter match, number of changed lines, diff (dry run only), io time, match time, error
+    """
+    try:
+        result = _swap_file_content(file_path, editor, byte_pattern, if_not_exist, is_append, line_break, dry_run)
+        return result + (None,)
+    except (OSError, UnicodeError) as e:
+        # e.g. a binary file: skipped, the other files are still processed
+        return file_path, False, 0, None, 0.0, 0.0, repr(e)
+
+
+def _swap_file_content(file_path: str, editor, byte_pattern: re.Pattern[bytes] | None, if_not_exist: bool,
+                       is_append: bool, line_break: str,
+                       dry_run: bool) -> tuple[str, bool, int, str | None, float, float]:
+    io_time: float = 0.0
+    match_time: float = 0.0
+    start = perf_counter()
+    if byte_pattern is not None:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        io_time += perf_counter() - start
+        start = perf_counter()
+        is_match = byte_pattern.search(data) is not None
+        match_time += perf_counter() - start
+        if not is_match:
+            return file_path, False, 0, None, io_time, match_time
+        start = perf_counter()
+    # Read as text, the same way update_file does
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+    io_time += perf_counter() - start
+    start = perf_counter()
+    new_lines: list[str] = [editor.apply(line, if_not_exist, is_append, line_break) for line in lines]
+    change_count: int = sum(1 for line, new_line in zip(lines, new_lines) if line != new_line)
+    diff: str | None = None
+    if dry_run and change_count > 0:
+        diff = ''.join(unified_diff(lines, [line for line in new_lines if line], fromfile=file_path, tofile=file_path))
+    match_time += perf_counter() - start
+    if change_count > 0 and not dry_run:
+        start = perf_counter()
+        with atomic_open(file_path, 'w') as f:
+            f.writelines(new_lines)
+        io_time += perf_counter() - start
+    return file_path, True, change_count, diff, io_time, match_time
+
+
+def get_pool_chunk_size(task_count: int, processes: int | None) -> int:
+    # About 4 chunks per worker: few round trips, while still balancing uneven file sizes
+    return max(1, task_count // ((processes or os.cpu_count() or 1) * 4))
+
+
+def _swap_files(root_path, editor, includes: list[str], excludes: list[str], if_not_exist: bool, is_append: bool,
+                dry_run: bool, processes: int | None) -> BulkSwapReportDto:
+    logger: LogDisplay = LogDisplay().get_log_display()
+    report = BulkSwapReportDto(dry_run)
+    wall_start = perf_counter()
+    files: list[str] = find_files(root_path, includes, excludes, onerror=_error_recorder(report.errors))
+    report.files_scanned = len(files)
+    report.discovery_time = perf_counter() - wall_start
+    logger.show_debug_log(' - bulk swap: {} files found in {:.3f}s', len(files), report.discovery_time)
+    byte_pattern = _compile_byte_pattern(editor.needles, _get_text_encoding())
+    line_break: str = boxtools.env.environment.get_line_break()
+    tasks = [(file_path, editor, byte_pattern, if_not_exist, is_append, line_break, dry_run) for file_path in files]
+    if processes == 1 or len(tasks) < POOL_MIN_FILES:
+        results = [_swap_file(*task) for task in tasks]
+    else:
+        with Pool(processes) as pool:
+            results = pool.starmap(_swap_file, tasks, chunksize=get_pool_chunk_size(len(tasks), processes))
+    for file_path, is_match, change_count, diff, io_time, match_time, error in results:
+        if error is not None:
+            report.errors[file_path] = error
+            logger.show_debug_log(' - bulk swap: {} skipped: {}', file_path, error)
+            continue
+        report.io_time += io_time
+        report.match_time += match_time
+        if is_match:
+            report.files_matched += 1
+        if change_count > 0:
+            report.changes[file_path] = change_count
+        if diff is not None:
+            report.diffs[file_path] = diff
+    report.wall_time = perf_counter() - wall_start
+    logger.show_debug_log(lambda: ' - bulk swap: {!r}'.format(report))
+    return report
+
+
+def bulk_update_files(root_path, replace_map: dict | ReplaceRuleSet, includes: list[str] = None,
+                      excludes: list[str] = None, if_not_exist: bool = False, is_append: bool = False,
+                      dry_run: bool = False, processes: int = None) -> BulkSwapReportDto:
+    """
+    fileContentSwapper.update_file on every file under root_path. Files containing no rule key are skipped after a
+    byte level search, the others are rewritten (atomically, and only if changed) in a process pool.
+    A file that can't be read as text (e.g. a binary file) or written is skipped and reported in report.errors.
+    :param includes: see find_files
+    :param excludes: see find_files
+    :param dry_run: nothing is written, the report holds a unified diff per file instead
+    :param processes: size of the process pool, defaults to the number of CPUs. 1 to stay in process
+    """
+    rule_set = replace_map if isinstance(replace_map, ReplaceRuleSet) else ReplaceRuleSet(replace_map)
+    return _swap_files(root_path, rule_set, includes, excludes, if_not_exist, is_append, dry_run, processes)
+
+
+def bulk_remove_lines_by_content(root_path, texts: list[str], includes: list[str] = None,
+                                 excludes: list[str] = None, dry_run: bool = False,
+                                 processes: int = None) -> BulkSwapReportDto:
+    """
+    fileContentSwapper.remove_lines_by_content on every file under root_path, see bulk_update_files
+    """
+    return _swap_files(root_path, _LineRemover(texts), includes, excludes, False, False, dry_run, processes)
+
+
+def _expand_tabs_worker(file_path: str, tab_size: int) -> tuple[str, bool, str | None]:
+    """
+    :return: file_path, whether it changed, error message
+    """
+    try:
+        return file_path, expand_tabs_in_file(file_path, tab_size), None
+    except OSError as e:
+        return file_path, False, repr(e)
+
+
+def bulk_expand_tabs(root_path, includes: list[str] = None, excludes: list[str] = None, tab_size: int = 4,
+                     ignore_case: bool = True, processes: int = None) -> tuple[list[str], dict[str, str]]:
+    """
+    expand_tabs_in_file on every file under root_path (see find_files), in a process pool
+    :return: changed file paths, and file path -> error for the files that couldn't be converted (and the
+    directories that couldn't be listed)
+    """
+    errors: dict[str, str] = {}
+    files: list[str] = find_files(root_path, includes, excludes, ignore_case, onerror=_error_recorder(errors))
+    tasks = [(file_path, tab_size) for file_path in files]
+    if processes == 1 or len(tasks) < POOL_MIN_FILES:
+        results = [_expand_tabs_worker(*task) for task in tasks]
+    else:
+        with Pool(processes) as pool:
+            results = pool.starmap(_expand_tabs_worker, tasks, chunksize=get_pool_chunk_size(len(tasks), processes))
+    changed: list[str] = [file_path for file_path, is_changed, error in results if is_changed]
+    errors.update((file_path, error) for file_path, is_changed, error in results if error is not None)
+    return changed, errors
@@ -1,41 +1,213 @@
 #!/usr/bin/env python3
 
+import codecs
+import locale
+import mmap
+import os
+import re
+from itertools import islice
 from pathlib import PurePath
 
 import boxtools.env.environment
 from boxtools.Logs import LogDisplay
 from boxtools.exception.Exceptions import ParseException
 from boxtools.data.util.Settings import Settings
-from boxtools.env.environment import validate_tool
 from boxtools.data.access.fileAccess import get_box_config_ini_file_path
+from boxtools.data.util.FileStampCache import FileStampCache
+from boxtools.data.util.fileUtils import atomic_open
+from boxtools.data.swapper.LineIndex import LineIndex, get_line_index, put_line_index, copy_range
 from boxtools.data.util.stringUtils import new_line
 
 
-def update_file(file_path, replace_map, if_not_exist: bool = False, is_append: bool = False):
-    # Open file
-    with open(file_path, "r") as file_content:
-        # list all Lines for an update
-        list_of_lines = file_content.readlines()
-        # Find wanted line(s)
-        for line_number, line in enumerate(list_of_lines):
-            for k, v in replace_map.items():
-                is_replace_line = str(k).endswith('.*') & line.startswith(k[0:len(k) - 2])
-                if is_replace_line:
-                    # Update the desired line(s)
-                    list_of_lines[line_number] = v + boxtools.env.environment.get_line_break()
-                elif k in line and ((if_not_exist and v not in line) or not if_not_exist):
-                    new_str = v if not is_append else (k + v)
-                    list_of_lines[line_number] = list_of_lines[line_number].replace(k, new_str)
-    # Write it out
-    replace_in_file(file_path, list_of_lines)
+def compile_texts_pattern(texts) -> re.Pattern[str] | bool | None:
+    """
+    :return: a regex searching any of texts, None if any line matches (a text is empty), False if none does
+    """
+    texts = set(texts)
+    if '' in texts:
+        return None
+    if not texts:
+        return False
+    # longest first: no difference for a search, but fewer backtracks on shared prefixes
+    return re.compile('|'.join(re.escape(text) for text in sorted(texts, key=len, reverse=True)))
 
-def remove_lines_by_content(file_path: str, texts: list[str]):
+
+class ReplaceRuleSet:
+    """
+    replace_map compiled once for update_file: keys ending with '.*' replace the whole lines starting with the key
+    prefix, other keys are replaced within the line. Lines containing none of the keys (nor prefixes) are found
+    with a single regex search and left untouched, only the other lines go through the rules one by one.
+    """
+    def __init__(self, replace_map: dict):
+        # (key, value, prefix or None, key + value), in replace_map order
+        self.rules: list[tuple[str, str, str | None, str]] = []
+        # texts that a line must contain to be changed by any rule
+        self.needles: set[str] = set()
+        for k, v in replace_map.items():
+            k = str(k)
+            prefix = k[0:len(k) - 2] if k.endswith('.*') else None
+            self.rules.append((k, v, prefix, k + v))
+            # a line starting with the prefix contains it, and the prefix is part of the key
+            self.needles.add(prefix if prefix is not None else k)
+        self.candidate_pattern = compile_texts_pattern(self.needles)
+
+    def is_candidate(self, line: str) -> bool:
+        if self.candidate_pattern is None:
+            return True
+        return self.candidate_pattern is not False and self.candidate_pattern.search(line) is not None
+
+    def apply(self, line: str, if_not_exist: bool = False, is_append: bool = False, line_break: str = None) -> str:
+        """
+        :return: line with every rule applied (rules are matched against the original line)
+        """
+        if not self.is_candidate(line):
+            return line
+        if line_break is None:
+            line_break = boxtools.env.environment.get_line_break()
+        result = line
+        for k, v, prefix, appended in self.rules:
+            if prefix is not None and line.startswith(prefix):
+                # Update the desired line(s)
+                result = v + line_break
+            elif k in line and (not if_not_exist or v not in line):
+                result = result.replace(k, appended if is_append else v)
+        return result
+
+
+def update_file(file_path, replace_map: dict | ReplaceRuleSet, if_not_exist: bool = False, is_append: bool = False):
+    """
+    :param replace_map: {key: value}, or a ReplaceRuleSet to reuse across files
+    """
+    rule_set = replace_map if isinstance(replace_map, ReplaceRuleSet) else ReplaceRuleSet(replace_map)
+    line_break = boxtools.env.environment.get_line_break()
+    edit_lines(file_path, lambda lines: (rule_set.apply(line, if_not_exist, is_append, line_break) for line in lines))
+
+
+class _NoChange(Exception):
+    """
+    Raised by an edit_lines transform to leave the file untouched
+    """
+
+
+def edit_lines(file_path, transform) -> bool:
+    """
+    Stream file_path through transform, into a sibling temporary file moved over file_path once complete
+    (see atomic_open): memory use doesn't depend on the file size, and the file is never left truncated.
+    :param transform: function taking the iterator of the file lines (new line included),
+    and returning the iterable of the lines to write. It may raise _NoChange to abort the edit
+    :return: False if the edit was aborted
+    """
+    try:
+        with open(file_path, "r") as src, atomic_open(file_path, "w") as dst:
+            dst.writelines(transform(src))
+    except _NoChange:
+        return False
+    return True
+
+
+def _count_lines(file_path) -> int:
     with open(file_path, "r") as f:
-        lines = f.readlines()
-    with open(file_path, "w") as f:
+        return sum(1 for _ in f)
+
+
+def _resolve_line_numbers(file_path, line_numbers) -> list[int]:
+    # Negative line numbers are counted from the end, as list indexes: only then is the file length needed
+    if all(line_number >= 0 for line_number in line_numbers):
+        return list(line_numbers)
+    nb_lines = _count_lines(file_path)
+    return [line_number + nb_lines if line_number < 0 else line_number for line_number in line_numbers]
+
+
+def _get_byte_line_index(file_path) -> LineIndex | None:
+    """
+    :return: the cached line index of file_path, or None if its lines can't be edited as bytes
+    (text mode would split lines on '\r' too, or decode the content differently)
+    """
+    if _get_text_encoding() not in _BYTE_SCAN_ENCODINGS:
+        return None
+    line_index = get_line_index(file_path)
+    return None if line_index.has_cr else line_index
+
+
+def _resolve_indexed_line_number(line_index: LineIndex, line_number: int) -> int:
+    line_count = line_index.get_line_count()
+    resolved = line_number + line_count if line_number < 0 else line_number
+    if not 0 <= resolved < line_count:
+        raise IndexError('list index out of range')
+    return resolved
+
+
+def _read_indexed_line(file_path, line_index: LineIndex, line_number: int) -> str:
+    with open(file_path, "rb") as f:
+        start = line_index.get_line_start(line_number)
+        f.seek(start)
+        return f.read(line_index.get_line_end(line_number) - start).decode(_get_text_encoding())
+
+
+def _splice_file(file_path, line_index: LineIndex, splices: list[tuple[int, int, str]]):
+    """
+    Replace byte ranges of file_path: the rest of the file is copied as is, in large chunks, to a temporary file
+    moved over file_path (see atomic_open). The line index is updated rather than rebuilt
+    :param splices: (start, end, text), not overlapping
+    """
+    encoding: str = _get_text_encoding()
+    byte_splices: list[tuple[int, int, bytes]] = sorted(((start, end, text.encode(encoding))
+                                                         for start, end, text in splices), key=lambda splice: splice[0])
+    with open(file_path, "rb") as src, atomic_open(file_path, "wb") as dst:
+        position: int = 0
+        for start, end, data in byte_splices:
+            copy_range(src, dst, start - position)
+            dst.write(data)
+            src.seek(end)
+            position = end
+        copy_range(src, dst, line_index.size - position)
+    put_line_index(file_path, line_index.splice(byte_splices))
+
+
+def _edit_line(file_path, line_number: int, edit) -> bool:
+    """
+    Stream file_path, replacing the line at index line_number by edit(line)
+    :raise IndexError: if there is no such line (the file is left untouched)
+    """
+    line_number = _resolve_line_numbers(file_path, [line_number])[0]
+
+    def transform(lines):
+        found: bool = False
+        for index, line in enumerate(lines):
+            if index == line_number:
+                found = True
+                line = edit(line)
+            yield line
+        if not found:
+            raise IndexError('list index out of range')
+    return edit_lines(file_path, transform)
+
+
+def remove_lines_by_content(file_path: str, texts: list[str], with_removed_lines: bool = False) -> int | dict[str, int]:
+    """
+    Remove the lines containing any of texts, in a single streamed pass (the file is not rewritten if none is found)
+    :param with_removed_lines: return the removed lines (without new line character) and how many times each one was
+    removed, instead of the number of removed lines
+    """
+    pattern = compile_texts_pattern(texts)
+    removed_lines: dict[str, int] = {}
+    removed_count: int = 0
+
+    def transform(lines):
+        nonlocal removed_count
         for line in lines:
-            if not any(text in line for text in texts):
-                f.write(line)
+            if pattern is not None and pattern.search(line) is None:
+                yield line
+                continue
+            removed_count += 1
+            if with_removed_lines:
+                key = line.rstrip('\n')
+                removed_lines[key] = removed_lines.get(key, 0) + 1
+        if removed_count == 0:
+            raise _NoChange()
+    if pattern is not False:
+        edit_lines(file_path, transform)
+    return removed_lines if with_removed_lines else removed_count
 
 
 def add_to_file(file_path: str, list_of_lines):
@@ -44,9 +216,114 @@ def add_to_file(file_path: str, list_of_lines):
     file_content.close()
 
 def replace_in_file(file_path: str, list_of_lines):
-    file_content = open(file_path, "w")
-    file_content.writelines(list_of_lines)
-    file_content.close()
+    with atomic_open(file_path, "w") as file_content:
+        file_content.writelines(list_of_lines)
+
+
+# indent, then "key", 'key' or key (groups 2 to 4), followed by ':' (group 5) and a space or the end of line.
+# Group 6: the value
+_yml_key_pattern = re.compile(
+    r'( *)(?:"([^"]*)"|\'([^\']*)\'|([^\s#\'"\-][^:#]*?|-[^\s:#][^:#]*?))[ \t]*(:)(?:[ \t]+(.*?))?[ \t]*')
+
+
+def _read_yml_path_index(file_path: str) -> dict[tuple[str, ...], int]:
+    """
+    One pass over the file: (key, sub key, ...) -> line number, for every mapping key (first occurrence wins).
+    Any indent width is supported. Keys within list items and block scalars (| or >) content are not indexed.
+    """
+    index: dict[tuple[str, ...], int] = {}
+    # (indent, key) of the current line ancestors
+    stack: list[tuple[int, str]] = []
+    block_indent: int | None = None
+    with open(file_path, "r") as f:
+        for line_number, line in enumerate(f):
+            content = line.rstrip('\r\n')
+            stripped = content.lstrip(' ')
+            if not stripped or stripped.startswith('#'):
+                continue
+            indent = len(content) - len(stripped)
+            if block_indent is not None:
+                if indent > block_indent:
+                    continue
+                block_indent = None
+            if stripped.startswith('---') or stripped.startswith('...'):
+                # new document
+                stack.clear()
+                continue
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            if stripped == '-' or stripped.startswith('- '):
+                # list item: skip its content
+                block_indent = indent
+                continue
+            match = _yml_key_pattern.fullmatch(content)
+            if match is None:
+                continue
+            key = next(group for group in match.group(2, 3, 4) if group is not None)
+            stack.append((indent, key))
+            index.setdefault(tuple(stack_key for _, stack_key in stack), line_number)
+            value = match.group(6)
+            if value and value[0] in '|>':
+                block_indent = indent
+    return index
+
+
+# Process-wide yml path indexes, rebuilt only when the file changes
+_yml_path_index_cache = FileStampCache(_read_yml_path_index)
+
+
+def _to_yml_path(path: str | list[str] | tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(path.split('.')) if isinstance(path, str) else tuple(path)
+
+
+def get_yml_path_index(file_path) -> dict[str, int]:
+    """
+    :return: dotted path (e.g. 'spring.datasource.url') -> line number, for every key of the yml file
+    """
+    return {'.'.join(path): line_number for path, line_number in _yml_path_index_cache.get(file_path).items()}
+
+
+def get_lines_by_yml_paths(file_path, paths: list[str | list[str]]) -> dict[str, int | None]:
+    """
+    Batch lookup on the cached yml path index
+    :param paths: dotted paths ('spring.datasource.url'), or key lists for keys containing a '.'
+    :return: path (dotted) -> line number, None if not found
+    """
+    index = _yml_path_index_cache.get(file_path)
+    result: dict[str, int | None] = {}
+    for path in paths:
+        yml_path = _to_yml_path(path)
+        result['.'.join(yml_path)] = index.get(yml_path)
+    return result
+
+
+def update_yml_values(file_path, values: dict[str, str]) -> list[str]:
+    """
+    Replace the values of several keys in a single rewrite: indent & key are kept, the rest of the line
+    (value and comment) becomes ': ' + value
+    :param values: dotted path -> new (already formatted) value
+    :return: paths not found (left untouched)
+    """
+    index = _yml_path_index_cache.get(file_path)
+    updates: dict[int, str] = {}
+    missing: list[str] = []
+    for path, value in values.items():
+        line_number = index.get(_to_yml_path(path))
+        if line_number is None:
+            missing.append(path)
+        else:
+            updates[line_number] = value
+    if updates:
+        def transform(lines):
+            for line_number, line in enumerate(lines):
+                value = updates.get(line_number)
+                if value is not None:
+                    match = _yml_key_pattern.fullmatch(line.rstrip('\r\n'))
+                    line = line[:match.start(5)] + ': ' + value + '\n'
+                yield line
+        edit_lines(file_path, transform)
+        _yml_path_index_cache.invalidate(file_path)
+    return missing
 
 
 # hierarchy_array: ['toto', 'tata', 'titi'] for
@@ -55,8 +332,16 @@ def replace_in_file(file_path: str, list_of_lines):
 #     titi: someValue
 # Notes:
 # - MUST be full hierarchy (aka first item must have a 0 space indent.
-# - MUST be a correctly indented yml file (2 spaces indent added per level)
+# - Exact keys are looked up in the cached yml path index (any indent width). Otherwise, falls back to a scan
+#   matching key prefixes on a correctly indented yml file (2 spaces indent added per level)
 def get_line_by_yml_hierarchy(file_path, hierarchy_array):
+    line_number = _yml_path_index_cache.get(file_path).get(tuple(hierarchy_array))
+    if line_number is not None:
+        return line_number
+    return _scan_yml_hierarchy(file_path, hierarchy_array)
+
+
+def _scan_yml_hierarchy(file_path, hierarchy_array):
     # Open file
     with open(file_path, "r") as file_content:
         # list all Lines for an update
@@ -83,18 +368,49 @@ def get_line_by_yml_hierarchy(file_path, hierarchy_array):
 
 
 def update_line(file_path, line_number, value):
-    file_content = open(file_path, "r")
-    list_of_lines = file_content.readlines()
-    list_of_lines[line_number] = value + "\n"
-    replace_in_file(file_path, list_of_lines)
+    line_index = _get_byte_line_index(file_path)
+    if line_index is None:
+        _edit_line(file_path, line_number, lambda line: value + "\n")
+        return
+    line_number = _resolve_indexed_line_number(line_index, line_number)
+    _splice_file(file_path, line_index, [(line_index.get_line_start(line_number), line_index.get_line_end(line_number),
+                                          value + "\n")])
 
 def add_line(file_path, line_number, value, no_duplicate: bool = False):
-    file_content = open(file_path, "r")
-    list_of_lines = file_content.readlines()
-    if no_duplicate and value in list_of_lines[line_number]:
+    # Same as list.insert: a line number past the end appends the line
+    line_index = _get_byte_line_index(file_path)
+    if line_index is not None:
+        line_count = line_index.get_line_count()
+        if no_duplicate:
+            line_number = _resolve_indexed_line_number(line_index, line_number)
+            if value in _read_indexed_line(file_path, line_index, line_number):
+                return
+        elif line_number < 0:
+            line_number = max(0, line_number + line_count)
+        position = line_index.get_line_start(line_number) if line_number < line_count else line_index.size
+        _splice_file(file_path, line_index, [(position, position, value + new_line())])
         return
-    list_of_lines.insert(line_number, value + new_line())
-    replace_in_file(file_path, list_of_lines)
+    line_number = _resolve_line_numbers(file_path, [line_number])[0]
+    if line_number < 0:
+        if no_duplicate:
+            raise IndexError('list index out of range')
+        line_number = 0
+    new_value: str = value + new_line()
+
+    def transform(lines):
+        inserted: bool = False
+        for index, line in enumerate(lines):
+            if index == line_number:
+                if no_duplicate and value in line:
+                    raise _NoChange()
+                inserted = True
+                yield new_value
+            yield line
+        if not inserted:
+            if no_duplicate:
+                raise IndexError('list index out of range')
+            yield new_value
+    edit_lines(file_path, transform)
 
 def add_line_before_text(file_path, matched_text: str, value: str, no_duplicate: bool = False):
     file_content = open(file_path, "r")
@@ -109,23 +425,70 @@ def add_line_before_text(file_path, matched_text: str, value: str, no_duplicate:
 
 
 def append_to_line(file_path, line_number, value, no_duplicate: bool = False):
-    file_content = open(file_path, "r")
-    list_of_lines = file_content.readlines()
-    line: str = list_of_lines[line_number]
-    if no_duplicate and line.endswith(value):
+    # value is appended after the line's new line character
+    line_index = _get_byte_line_index(file_path)
+    if line_index is not None:
+        line_number = _resolve_indexed_line_number(line_index, line_number)
+        if no_duplicate and _read_indexed_line(file_path, line_index, line_number).endswith(value):
+            return
+        position = line_index.get_line_end(line_number)
+        _splice_file(file_path, line_index, [(position, position, value)])
         return
-    list_of_lines[line_number] += value
-    replace_in_file(file_path, list_of_lines)
+
+    def edit(line: str) -> str:
+        if no_duplicate and line.endswith(value):
+            raise _NoChange()
+        return line + value
+    _edit_line(file_path, line_number, edit)
 
 
 def prepend_to_lines(file_path, line_numbers: list[int], value: str, no_duplicate: bool = False):
-    file_content = open(file_path, "r")
-    list_of_lines = file_content.readlines()
+    line_index = _get_byte_line_index(file_path)
+    if line_index is not None:
+        _prepend_to_indexed_lines(file_path, line_index, line_numbers, value, no_duplicate)
+        return
+    resolved_line_numbers: list[int] = _resolve_line_numbers(file_path, line_numbers)
+    # A line number listed n times is prepended n times
+    counts: dict[int, int] = {}
+    for line_number in resolved_line_numbers:
+        if line_number < 0:
+            raise IndexError('list index out of range')
+        counts[line_number] = counts.get(line_number, 0) + 1
+
+    def transform(lines):
+        found: int = 0
+        for index, line in enumerate(lines):
+            count = counts.get(index)
+            if count is not None:
+                found += 1
+                for _ in range(count):
+                    if not no_duplicate or not line.startswith(value):
+                        line = value + line
+            yield line
+        if found != len(counts):
+            raise IndexError('list index out of range')
+    edit_lines(file_path, transform)
+
+
+def _prepend_to_indexed_lines(file_path, line_index: LineIndex, line_numbers: list[int], value: str,
+                              no_duplicate: bool):
+    # A line number listed n times is prepended n times
+    counts: dict[int, int] = {}
     for line_number in line_numbers:
-        line: str = list_of_lines[line_number]
-        if not no_duplicate or not line.startswith(value):
-            list_of_lines[line_number] = value + line
-    replace_in_file(file_path, list_of_lines)
+        line_number = _resolve_indexed_line_number(line_index, line_number)
+        counts[line_number] = counts.get(line_number, 0) + 1
+    splices: list[tuple[int, int, str]] = []
+    for line_number, count in counts.items():
+        prefix: str = ''
+        line: str | None = _read_indexed_line(file_path, line_index, line_number) if no_duplicate else None
+        for _ in range(count):
+            if not no_duplicate or not (prefix + line).startswith(value):
+                prefix = value + prefix
+        if prefix:
+            position = line_index.get_line_start(line_number)
+            splices.append((position, position, prefix))
+    if splices:
+        _splice_file(file_path, line_index, splices)
 
 
 def prepend_to_line_by_text(file_path, matched_text: str, value, no_duplicate: bool = False, match_cnt: int = -1):
@@ -166,21 +529,93 @@ def _find_text_in_lines(lines: list[str], text: str, stop_on_first: bool = True)
 
 
 def find_lines_by_text(file_path, text: str, stop_on_first: bool = False) -> list[int]:
-    file_content = open(file_path, "r")
-    list_of_lines = file_content.readlines()
-    return _find_text_in_lines(lines=list_of_lines,
-                               text=text,
-                               stop_on_first=stop_on_first)
+    return find_lines_by_texts(file_path, [text], stop_on_first)[text]
+
+
+def find_lines_by_texts(file_path, texts: list[str], stop_on_first: bool = False) -> dict[str, list[int]]:
+    """
+    Search many texts in a single pass: the file is memory-mapped, and one regex made of every text finds the
+    candidate lines, whose numbers are counted incrementally. Only candidate lines are then checked for each text.
+    Same results as find_lines_by_text on each text.
+    :param stop_on_first: only the first matching line of each text
+    :return: text -> line numbers of the lines containing it
+    """
+    matches: dict[str, list[int]] = {text: [] for text in texts}
+    if not matches:
+        return matches
+    encoding: str = _get_text_encoding()
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return matches
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Text mode lines are also split on '\r': only plain '\n' files are scanned as bytes
+            if encoding not in _BYTE_SCAN_ENCODINGS or '' in matches or mm.find(b'\r') >= 0:
+                return _find_texts_in_text_lines(file_path, matches, stop_on_first)
+            needles: list[tuple[str, bytes]] = [(text, text.encode(encoding)) for text in matches]
+            pattern = re.compile(b'|'.join(re.escape(needle) for _, needle in needles))
+            remaining: int = len(needles)
+            line_number: int = 0
+            counted_to: int = 0
+            match = pattern.search(mm)
+            while match is not None:
+                start = mm.rfind(b'\n', 0, match.start()) + 1
+                end = mm.find(b'\n', match.start())
+                end = size if end < 0 else end + 1
+                line_number += mm[counted_to:start].count(b'\n')
+                counted_to = start
+                line = mm[start:end]
+                for text, needle in needles:
+                    if needle in line and not (stop_on_first and matches[text]):
+                        matches[text].append(line_number)
+                        if stop_on_first:
+                            remaining -= 1
+                if stop_on_first and remaining == 0:
+                    break
+                match = pattern.search(mm, end)
+    return matches
+
 
+# Encodings in which a text found in the bytes of a line is exactly a text found in the decoded line
+_BYTE_SCAN_ENCODINGS: set[str] = {'utf-8', 'ascii', 'iso8859-1'}
 
-def add_lines(file_path: str, nb_lines: int, text: str):
-    with open(file_path) as infile:
-        lines = infile.readlines()
-    with open(file_path, 'w') as outfile:
-        for i,line in enumerate(lines):
-            outfile.write(line)
-            if not i%nb_lines:
-                outfile.write(text + '\n')
+
+def _get_text_encoding() -> str:
+    # Encoding used by open() in text mode
+    return codecs.lookup(locale.getpreferredencoding(False)).name
+
+
+def _find_texts_in_text_lines(file_path, matches: dict[str, list[int]], stop_on_first: bool) -> dict[str, list[int]]:
+    with open(file_path, "r") as f:
+        for line_number, line in enumerate(f):
+            for text, text_matches in matches.items():
+                if text in line and not (stop_on_first and text_matches):
+                    text_matches.append(line_number)
+    return matches
+
+
+def add_lines(file_path: str, nb_lines: int, text: str, start_offset: int = 0):
+    """
+    Insert text as a new line after every nb_lines lines, in a single streamed pass
+    :param start_offset: index of the first line followed by text (the next ones being start_offset + nb_lines,
+    start_offset + 2 * nb_lines...). Use nb_lines - 1 to insert text after each complete block of nb_lines lines
+    """
+    if nb_lines < 1 or start_offset < 0:
+        raise ValueError('add_lines: nb_lines must be > 0 and start_offset >= 0')
+    text_line: str = text + '\n'
+
+    def transform(lines):
+        # first block: lines 0 to start_offset, then blocks of nb_lines lines. Only complete blocks are followed by text
+        block_size: int = start_offset + 1
+        while True:
+            block = list(islice(lines, block_size))
+            if len(block) < block_size:
+                yield ''.join(block)
+                return
+            # a last line without new line character: text still goes on a line of its own
+            yield ''.join(block) + (text_line if block[-1].endswith('\n') else '\n' + text_line)
+            block_size = nb_lines
+    edit_lines(file_path, transform)
 
 def prepend_text(filename: str | PurePath, text: str):
     from fileinput import input
@@ -191,21 +626,28 @@ def prepend_text(filename: str | PurePath, text: str):
             print(line, end="")
 
 
+def expand_tabs_in_file(file_path, tab_size: int = 4) -> bool:
+    """
+    Replace tabs by spaces, as expand -t <tab_size> does (columns are counted in bytes)
+    :return: False if the file has no tab (it is then left untouched)
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if b'\t' not in data:
+        return False
+    with atomic_open(file_path, 'wb') as f:
+        f.write(data.expandtabs(tab_size))
+    return True
+
+
 def t2s(path_to_convert: str):
     logger: LogDisplay = LogDisplay().get_log_display()
-    validate_tool('expand')
-    validate_tool('sponge')
-    cmd: str = "expand -t 4 " + path_to_convert + " | sponge " + path_to_convert
-    logger.show_command_log(cmd)
-    from os import system
-    system(cmd)
+    logger.show_debug_log(' - expanding tabs in {}', path_to_convert)
+    expand_tabs_in_file(path_to_convert, 4)
 
 
 def dt2s(path_to_convert: str, box_path: PurePath, user_ini_file: str = 'user.ini'):
     logger: LogDisplay = LogDisplay().get_log_display()
-    validate_tool('find')
-    validate_tool('expand')
-    validate_tool('sponge')
     extensions: list = ['*.java']
     try:
         user_settings: Settings | None = Settings(get_box_config_ini_file_path(file_name=user_ini_file))
@@ -220,15 +662,14 @@ def dt2s(path_to_convert: str, box_path: PurePath, user_ini_file: str = 'user.in
         print(str(pe))
         print('Defaulting to *.java extension only')
 
-    filename_cmd: str = '-iname '
-    if len(extensions) > 0:
-        filename_cmd += (' -o -iname '.join(extensions))
-        filename_cmd = '\\( ' + filename_cmd + ' \\)'
-    cmd: str = f"find {path_to_convert} -type f {filename_cmd} -execdir sh -c 'expand -t 4 \"{{}}\" | sponge \"{{}}\"' \\;"
-    logger.show_command_log(cmd)
-    from os import system
-    res = system(cmd)
-    if res != 0:
+    from boxtools.data.swapper.bulkSwapper import bulk_expand_tabs
+    logger.show_debug_log(' - expanding tabs in {} files under {}', extensions, path_to_convert)
+    # extensions are matched on file names only, case-insensitively (as find -iname)
+    changed, errors = bulk_expand_tabs(path_to_convert, includes=[extension.strip() for extension in extensions])
+    logger.show_debug_log(lambda: ' - converted files:\n{}'.format('\n'.join(changed)))
+    if len(errors) > 0:
+        for file_path, error in errors.items():
+            logger.show_critical_log(' - {}: {}', file_path, error)
         logger.show_critical_log('Failure in dt2s command')
     else:
-        logger.show_info_log(f'Success')
\ No newline at end of file
+        logger.show_info_log(f'Success')
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 
+from bisect import bisect_left
+from multiprocessing import Pool
 from pathlib import PurePath
 from re import compile
 from typing import Pattern
 
 from boxtools.Logs import LogDisplay
 from boxtools.env.environment import mk_dir, get_path_separator
-from boxtools.data.access.fileAccess import glob_find, match_in_file, get_file_as_list
 from boxtools.data.swapper.fileContentSwapper import add_line, add_line_before_text, \
     prepend_to_line_by_text, prepend_to_lines, find_lines_by_text, update_line
-from boxtools.data.util.stringUtils import upper_first_letter, new_line
+from boxtools.data.swapper.FileEditSession import FileEditSession
+from boxtools.data.swapper.JavaCodeEmitter import JavaCodeEmitter, get_accessor_templates, emit_getter, emit_setter, \
+    emit_constructor
+from boxtools.data.swapper.JavaClassIndex import get_java_class_index
+from boxtools.data.swapper.JavaHeader import JavaHeader, get_java_header
+from boxtools.data.swapper.bulkSwapper import POOL_MIN_FILES, get_pool_chunk_size
 
 class_declaration_pattern: Pattern[str] = compile(
     "public class ([a-zA-Z0-9_<>]*) extends ([a-zA-Z0-9._]*)[a-zA-Z0-9._<> ,]* ?(implements [a-zA-Z0-9._<>])? ?{")
@@ -17,6 +23,90 @@ class_declaration_pattern: Pattern[str] = compile(
 abstract_class_declaration_pattern: Pattern[str] = compile(
     "public abstract class ([a-zA-Z0-9_]*)([a-zA-Z0-9._<> ,&]*)? ?{?")
 
+_import_line_pattern: Pattern[str] = compile(r'import\s+(static\s+)?([\w.]+(?:\.\*)?)\s*;')
+
+
+def _is_imported(class_name: str, imported: set[str]) -> bool:
+    # explicitly, or through a wildcard import of its package
+    package, _, _ = class_name.rpartition('.')
+    return class_name in imported or (package != '' and package + '.*' in imported)
+
+
+def _get_common_prefix_length(class_name: str, group: list[tuple[str, int]]) -> int:
+    # number of leading package segments class_name shares with the closest import of group
+    segments = class_name.split('.')[:-1]
+    best: int = 0
+    for name, _ in group:
+        length: int = 0
+        for segment, other_segment in zip(segments, name.split('.')[:-1]):
+            if segment != other_segment:
+                break
+            length += 1
+        best = max(best, length)
+    return best
+
+
+def _get_import_position(class_name: str, groups: list[list[tuple[str, int]]]) -> int:
+    """
+    :param groups: blocks of consecutive (non static) import lines: (name, line number)
+    :return: line number to insert the import of class_name before
+    """
+    # the group sharing the longest package prefix (the first one on ties): java.* imports next to java.* ones...
+    group = max(groups, key=lambda candidate: _get_common_prefix_length(class_name, candidate))
+    names: list[str] = [name for name, _ in group]
+    if names != sorted(names):
+        # unsorted group: no order to keep
+        return group[-1][1] + 1
+    position = bisect_left(names, class_name)
+    return group[position][1] if position < len(group) else group[-1][1] + 1
+
+
+def add_imports_to_file(file_path: PurePath, class_names: list[str]) -> list[str]:
+    """
+    Add import lines for class_names, skipping the ones already imported (explicitly or by a wildcard import),
+    in a single read & write. Each new import goes to the block of existing (non static) imports sharing the longest
+    package prefix with it, in sorted order if that block is sorted (at its end otherwise).
+    Without existing imports, they go 2 lines after the package declaration.
+    :return: the class names actually imported (nothing is done for a file without package declaration)
+    """
+    session = FileEditSession(file_path)
+    package_line_index: int = -1
+    imported: set[str] = set()
+    # blocks of consecutive non static imports: (name, line number)
+    groups: list[list[tuple[str, int]]] = []
+    for line_number, line in enumerate(session.lines):
+        if package_line_index < 0:
+            if line.startswith('package '):
+                package_line_index = line_number
+            continue
+        if line.startswith('import'):
+            match = _import_line_pattern.match(line)
+            if match is not None:
+                imported.add(match.group(2))
+                if match.group(1) is None:
+                    if groups and groups[-1][-1][1] == line_number - 1:
+                        groups[-1].append((match.group(2), line_number))
+                    else:
+                        groups.append([(match.group(2), line_number)])
+    if package_line_index < 0:
+        return []
+    to_import: list[str] = sorted({class_name for class_name in class_names if not _is_imported(class_name, imported)})
+    for class_name in to_import:
+        position = _get_import_position(class_name, groups) if groups else package_line_index + 2
+        session.insert(position, JavaTools.make_import_line(class_name))
+    session.commit()
+    return to_import
+
+
+def _match_in_lines(lines: list[str], compiled_regex: Pattern[str], group_id: int):
+    # Same as fileAccess.match_in_file, on lines already read
+    for line in lines:
+        result = compiled_regex.search(line)
+        if result is not None and result.groups() is not None and len(result.groups()) >= group_id:
+            return result.group(group_id)
+    return None
+
+
 class JavaTools:
     def __init__(self, logger: LogDisplay = None):
         if logger is None:
@@ -51,13 +141,32 @@ class JavaTools:
 
     @classmethod
     def get_extended_class_name_for_file(cls, file_path: PurePath, logging = None):
-        logging.debug(cls.get_indent() + '- get_extended_class_name_for_file -> Calling match_in_file for file ' + str(file_path))
-        return match_in_file(file_path, class_declaration_pattern, 2)
+        if logging is not None:
+            logging.debug(cls.get_indent() + '- get_extended_class_name_for_file -> Scanning header of file ' + str(file_path))
+        return _match_in_lines(get_java_header(file_path).lines, class_declaration_pattern, 2)
 
     @classmethod
     def is_abstract_class(cls, file_path: PurePath, logging = None) -> bool:
-        logging.debug(cls.get_indent() + '- is_abstract_class -> Calling match_in_file for file ' + str(file_path))
-        return match_in_file(file_path, abstract_class_declaration_pattern, 2) is not None
+        if logging is not None:
+            logging.debug(cls.get_indent() + '- is_abstract_class -> Scanning header of file ' + str(file_path))
+        return _match_in_lines(get_java_header(file_path).lines, abstract_class_declaration_pattern, 2) is not None
+
+    @staticmethod
+    def build_hierarchy(source_root: PurePath, processes: int = None):
+        """
+        :return: the JavaHierarchy of the types declared under source_root, to query ancestors, descendants and
+        concrete subclasses
+        """
+        from boxtools.data.swapper.JavaHierarchy import JavaHierarchy
+        return JavaHierarchy.build(source_root, processes)
+
+    @staticmethod
+    def get_java_header(file_path: PurePath) -> JavaHeader:
+        """
+        :return: package, imports and type declaration of file_path, read up to the type declaration only
+        (cached until the file changes)
+        """
+        return get_java_header(file_path)
 
     @staticmethod
     def get_indent() -> str:
@@ -67,43 +176,27 @@ class JavaTools:
     def get_java_class_package_value(file_path: str, package_str_to_match: str = 'package '):
         package_value = None
         if file_path is not None:
-            entity_file = open(file_path, 'r')
-
-            do_exit = False
-            while not do_exit:
-                # Get next line from file
-                line = entity_file.readline()
-
-                # if line is empty, end of file is reached
-                if not line:
-                    break
-
+            # The package declaration comes before the type declaration: the cached header is enough
+            for line in get_java_header(file_path).lines:
                 str_line = str(line).strip()
                 semicolon_index = str_line.find(';')
 
                 if package_str_to_match in line and semicolon_index > 0:
                     start_index = str_line.find('package')
                     package_value = str_line[start_index:semicolon_index].replace('package', '').strip()
-                    do_exit = True
-            entity_file.close()
+                    break
         return package_value
 
 
     @classmethod
     def add_getter(cls, indent_count: int, property_name: str, property_class: str, to_list: list, add_override: bool = True,
-                   date_format: str | None = None):
-        indent = cls.get_indent()
-        c_property_name = upper_first_letter(property_name)
-        getter_line = indent * indent_count + 'public ' + property_class + ' get' + c_property_name + '() { ' + new_line()
-        if getter_line not in to_list:
-            if date_format is not None:
-                to_list.append(indent + date_format + new_line())
-            if add_override:
-                to_list.append(indent * indent_count + '@Override' + new_line())
-            to_list.append(getter_line)
-            to_list.append(indent * (indent_count + 1) + 'return ' + property_name + '; ' + new_line())
-            to_list.append(indent * indent_count + '} ' + new_line())
-            to_list.append(new_line())
+                   date_format: str | None = None, seen: set[str] = None):
+        """
+        :param seen: getter/setter declaration lines already in to_list: checked instead of scanning to_list, and
+        updated. Share the same set across calls filling the same list
+        """
+        emit_getter(get_accessor_templates(cls.get_indent(), indent_count), property_name, property_class, to_list,
+                    add_override, date_format, seen)
 
 
     @classmethod
@@ -115,26 +208,12 @@ class JavaTools:
 
     @classmethod
     def add_setter(cls, indent_count: int, property_name: str, property_class: str, to_list: list, add_override: bool = True,
-                   optional_content: str = None):
-        indent = cls.get_indent()
-        c_property_name = upper_first_letter(property_name)
-        setter_line = indent * indent_count + 'public void set' + c_property_name + '(' + property_class + ' ' \
-                      + property_name + ') { ' + new_line()
-        if setter_line not in to_list:
-            if add_override:
-                to_list.append(indent * indent_count + '@Override' + new_line())
-            if (property_class and (property_class.startswith('List') or property_class.startswith('Set')
-                or property_class.startswith('Map'))):
-               to_list.append(indent * indent_count + '@Schema(accessMode = Schema.AccessMode.READ_ONLY)' + new_line())
-            to_list.append(setter_line)
-            to_list.append(indent * (indent_count + 1) + 'this.' + property_name + ' = ' + property_name + '; ' + new_line())
-            if optional_content is not None:
-                to_list.append(indent * (indent_count + 1) + optional_content + new_line())
-            to_list.append(indent * indent_count + '} ' + new_line())
-            to_list.append(new_line())
-        elif add_override:
-            to_list.append(new_line())
-            to_list.append(indent * indent_count + '@Override' + new_line())
+                   optional_content: str = None, seen: set[str] = None):
+        """
+        :param seen: see add_getter
+        """
+        emit_setter(get_accessor_templates(cls.get_indent(), indent_count), property_name, property_class, to_list,
+                    add_override, optional_content, seen)
 
 
     @classmethod
@@ -148,14 +227,17 @@ class JavaTools:
     def add_constructor(cls, indent_count: int, property_name: str, to_list: list,
                         optional_parameter_content: str = None,
                         optional_content: str = None):
-        indent = cls.get_indent()
-        c_property_name = upper_first_letter(property_name)
-        to_list.append(indent * indent_count + 'public ' + c_property_name
-                       + '(' + (optional_parameter_content if optional_parameter_content is not None else '') + ') {' + new_line())
-        if optional_content is not None:
-            to_list.append(indent * (indent_count + 1) + optional_content + new_line())
-        to_list.append(indent * indent_count + '}' + new_line())
-        to_list.append(new_line())
+        emit_constructor(get_accessor_templates(cls.get_indent(), indent_count), property_name, to_list,
+                         optional_parameter_content, optional_content)
+
+
+    @classmethod
+    def make_accessors(cls, indent_count: int, fields, add_override: bool = True) -> str:
+        """
+        :param fields: (property name, property class) pairs, or a property name -> property class dict
+        :return: getter and setter of every field, as a single string
+        """
+        return JavaCodeEmitter(indent_count, cls.get_indent()).add_accessors(fields, add_override).getvalue()
 
 
     @staticmethod
@@ -196,10 +278,10 @@ class JavaTools:
     def find_project_class(class_name: str, project_path: str):
         logger: LogDisplay = LogDisplay().get_log_display()
         c_file_name = class_name if class_name.endswith('.java') else class_name + '.java'
-        logger.show_debug_log(' - searching file: ' + str(c_file_name))
-        res = glob_find(c_file_name, project_path)
+        logger.show_debug_log(' - searching file: {}', c_file_name)
+        res = get_java_class_index(project_path).find_all(c_file_name)
         if len(res) > 0:
-            logger.show_debug_log(' - file found: ' + str(res))
+            logger.show_debug_log(' - file found: {}', res)
             return res[0]
         return None
 
@@ -210,23 +292,35 @@ class JavaTools:
 
     @classmethod
     def add_import(cls, file_path: PurePath, class_name: str):
-        # read file content
-        lines: list[str] = get_file_as_list(file_path=file_path, do_strip=False)
-        # find package declaration line
-        package_line_index: int = -1
-        for line in lines:
-            if line.startswith('package '):
-                package_line_index = lines.index(line)
-            if package_line_index >= 0 and line.startswith('import') and class_name in line:
-                # Don't add import if it already exists.
-                return
-        if package_line_index >= 0:
-            # insert import 2 lines after detected package declaration
-            add_line(file_path=file_path,
-                     line_number=package_line_index + 2,
-                     value=cls.make_import_line(class_name))
+        add_imports_to_file(file_path, [class_name])
+
+    @staticmethod
+    def add_imports(imports_by_file: dict, processes: int = None) -> dict[str, list[str]]:
+        """
+        Add imports to many files: see add_imports_to_file. Files are processed in a process pool
+        :param imports_by_file: file path -> class names to import
+        :param processes: size of the process pool, defaults to the number of CPUs. 1 to stay in process
+        :return: file path -> class names actually imported
+        """
+        tasks = [(file_path, list(class_names)) for file_path, class_names in imports_by_file.items()]
+        if processes == 1 or len(tasks) < POOL_MIN_FILES:
+            results = [(file_path, add_imports_to_file(file_path, class_names)) for file_path, class_names in tasks]
         else:
-            print('noncklsnqclkdn')
+            with Pool(processes) as pool:
+                results = zip([file_path for file_path, _ in tasks],
+                              pool.starmap(add_imports_to_file, tasks,
+                                           chunksize=get_pool_chunk_size(len(tasks), processes)))
+        return {str(file_path): added for file_path, added in results}
+
+    @staticmethod
+    def edit_session(file_path: PurePath) -> FileEditSession:
+        """
+        Batch several edits of file_path in a single read & write, with line numbers of the file as it is now:
+        with JavaTools.edit_session(file_path) as session:
+            session.insert(2, JavaTools.make_import_line('a.b.C'))
+            session.comment_text('System.out')
+        """
+        return FileEditSession(file_path)
 
     @staticmethod
     def add_line(file_path, line_number: int, value: str, no_duplicate: bool = True):
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import os
+from threading import Lock
+from typing import Any, Callable
+
+
+def get_file_stamp(file_path) -> tuple[int, int, int]:
+    """
+    :return: (mtime, size, inode) of file_path: changes when the file is written, or replaced (os.replace)
+    :raise OSError: if file_path can't be stat'ed
+    """
+    st = os.stat(file_path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class FileStampCache:
+    """
+    Process-wide cache of values loaded from files, keyed by resolved path (realpath).
+    An entry is only reused while the file's (mtime, size, inode) stamp is unchanged.
+    Cached values are shared: treat them as read-only.
+    """
+    def __init__(self, loader: Callable[[str], Any]):
+        """
+        :param loader: builds the value of a file from its resolved path
+        """
+        self.loader: Callable[[str], Any] = loader
+        self.entries: dict[str, tuple[tuple[int, int, int], Any]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def resolve(file_path) -> str:
+        return os.path.realpath(os.fspath(file_path))
+
+    def get(self, file_path):
+        """
+        :raise OSError: if file_path can't be stat'ed (nothing is cached then)
+        """
+        path: str = self.resolve(file_path)
+        stamp = get_file_stamp(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = self.loader(path)
+        with self.lock:
+            self.entries[path] = (stamp, value)
+        return value
+
+    def put(self, file_path, value):
+        """
+        Store the value of a file just written by the caller, stamped with its current state
+        """
+        path: str = self.resolve(file_path)
+        stamp = get_file_stamp(path)
+        with self.lock:
+            self.entries[path] = (stamp, value)
+
+    def invalidate(self, file_path=None):
+        """
+        :param file_path: the entry to drop, all of them if None
+        """
+        with self.lock:
+            if file_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(self.resolve(file_path), None)
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from configparser import ConfigParser
+from contextlib import contextmanager
 from pathlib import PurePath
 
 from boxtools.data.dto.ConfigurationChangeDto import ConfigurationChangeDto
@@ -11,46 +12,59 @@ class Settings:
     def __init__(self, file_path: PurePath):
         self.configuration_file_path = file_path
 
-    def get_settings(self) -> ConfigParser:
-        return iniParser.get_properties(self.configuration_file_path)
+    def get_settings(self, use_cache: bool = True) -> ConfigParser:
+        return iniParser.get_properties(self.configuration_file_path, use_cache)
 
     def get_settings_change(self) -> ConfigurationChangeDto:
         return iniParser.get_configuration_change(self.configuration_file_path)
 
-    def apply_settings_change(self, configuration_change: ConfigurationChangeDto):
-        iniParser.apply_configuration_change(self.configuration_file_path, configuration_change)
+    def apply_settings_change(self, configuration_change: ConfigurationChangeDto) -> bool:
+        return iniParser.apply_configuration_change(self.configuration_file_path, configuration_change)
+
+    @contextmanager
+    def settings_transaction(self):
+        """
+        Collect several changes and write them in a single (atomic) file rewrite when the block exits.
+        Nothing is written if the block raises, or if no collected value differs from the file.
+        Usage:
+            with settings.settings_transaction() as change:
+                change.add_property_change('SETTINGS', 'LOG_LEVEL', '3')
+        """
+        change = self.get_settings_change()
+        yield change
+        self.apply_settings_change(change)
 
     def apply_single_setting_change(self, property_group: str, property_name: str, property_value):
         change = self.get_settings_change()
         change.add_property_change(property_group, property_name, property_value)
         return self.apply_settings_change(change)
 
-    def has_setting(self, property_group: str, property_name: str):
-        return iniParser.has_property(self.configuration_file_path, property_group, property_name)
+    def has_setting(self, property_group: str, property_name: str, use_cache: bool = True):
+        return iniParser.has_property(self.configuration_file_path, property_group, property_name, use_cache)
 
-    def get_string_setting(self, property_group: str, property_name: str) -> str:
-        return iniParser.get_string_property(self.configuration_file_path, property_group, property_name)
+    def get_string_setting(self, property_group: str, property_name: str, use_cache: bool = True) -> str:
+        return iniParser.get_string_property(self.configuration_file_path, property_group, property_name, use_cache)
 
-    def get_bool_setting(self, property_group: str, property_name: str) -> bool:
-        return iniParser.get_boolean_property(self.configuration_file_path, property_group, property_name)
+    def get_bool_setting(self, property_group: str, property_name: str, use_cache: bool = True) -> bool:
+        return iniParser.get_boolean_property(self.configuration_file_path, property_group, property_name, use_cache)
 
-    def get_int_setting(self, property_group: str, property_name: str) -> int:
-        return iniParser.get_int_property(self.configuration_file_path, property_group, property_name)
+    def get_int_setting(self, property_group: str, property_name: str, use_cache: bool = True) -> int:
+        return iniParser.get_int_property(self.configuration_file_path, property_group, property_name, use_cache)
 
-    def get_float_setting(self, property_group: str, property_name: str) -> float:
-        return iniParser.get_float_property(self.configuration_file_path, property_group, property_name)
+    def get_float_setting(self, property_group: str, property_name: str, use_cache: bool = True) -> float:
+        return iniParser.get_float_property(self.configuration_file_path, property_group, property_name, use_cache)
 
-    def get_list_setting(self, property_group: str, property_name: str):
-        return iniParser.get_list_property(self.configuration_file_path, property_group, property_name)
+    def get_list_setting(self, property_group: str, property_name: str, use_cache: bool = True):
+        return iniParser.get_list_property(self.configuration_file_path, property_group, property_name, use_cache)
 
-    def get_section(self, property_group: str):
-        return self.get_settings()[property_group]
+    def get_section(self, property_group: str, use_cache: bool = True):
+        return self.get_settings(use_cache)[property_group]
 
-    def get_section_map(self, property_group: str):
-        return self.get_section(property_group).items()
+    def get_section_map(self, property_group: str, use_cache: bool = True):
+        return self.get_section(property_group, use_cache).items()
 
-    def get_section_dict(self, property_group: str):
-        return dict(self.get_section_map(property_group))
+    def get_section_dict(self, property_group: str, use_cache: bool = True):
+        return dict(self.get_section_map(property_group, use_cache))
 
-    def get_section_keys(self, property_group: str):
-        return self.get_section(property_group).keys()
+    def get_section_keys(self, property_group: str, use_cache: bool = True):
+        return self.get_section(property_group, use_cache).keys()
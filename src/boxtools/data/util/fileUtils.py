@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 
 import base64
+import errno
+import os
+import secrets
+import shutil
+import tempfile
+from contextlib import contextmanager
 
 def str_to_b64(input_str: str) -> str:
     """Encode a string to a base64 string.
@@ -24,4 +30,57 @@ def file_to_b64(file_path: str) -> str:
     """
     with open(file_path, 'rb') as f:
         b64_content = base64.b64encode(f.read()).decode('utf-8')
-    return b64_content
\ No newline at end of file
+    return b64_content
+
+def _create_temp_file(directory: str, prefix: str) -> tuple[int, str]:
+    # As tempfile.mkstemp, but with the mode open() gives new files: the kernel applies the umask to 0666,
+    # without reading or changing the process umask
+    flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_BINARY', 0)
+    for _ in range(tempfile.TMP_MAX):
+        tmp_path = os.path.join(directory, prefix + secrets.token_hex(4) + '.tmp')
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(errno.EEXIST, 'No usable temporary file name found', directory)
+
+@contextmanager
+def atomic_open(file_path, mode: str = 'w', encoding: str | None = None, newline: str | None = None):
+    """Open a sibling temporary file that replaces file_path once the block exits without error.
+
+    The temporary file is flushed, fsync'ed and moved over file_path with os.replace, so readers
+    either see the previous content or the new one, never a truncated file.
+    Symlinks are resolved first: the link target is replaced, the link itself is kept.
+    An existing file keeps its permissions; a new file gets the ones open() would give it (0666 & ~umask).
+    On error, the temporary file is removed and file_path is left untouched.
+
+    Args:
+        file_path: The path of the file to (re)write.
+        mode (str): 'w' or 'wb'.
+        encoding (str): Text encoding, ignored in binary mode.
+        newline (str): Newline translation, ignored in binary mode.
+
+    Yields:
+        The temporary file object to write to.
+    """
+    file_path = os.path.realpath(os.fspath(file_path))
+    directory = os.path.dirname(file_path)
+    fd, tmp_path = _create_temp_file(directory, '.' + os.path.basename(file_path) + '.')
+    try:
+        if 'b' in mode:
+            tmp_file = os.fdopen(fd, mode)
+        else:
+            tmp_file = os.fdopen(fd, mode, encoding=encoding, newline=newline)
+        with tmp_file:
+            yield tmp_file
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+JSON-lines log events: one JSON object per line, no colour codes.
+{"level": "INFO", "ts": 1760774400.123, "msg": "...", "method": "...", "headers": [...], "exc": {...}}
+"""
+
+import json
+import traceback
+from time import time
+
+_encode_str = json.encoder.encode_basestring_ascii
+# '{"level":"<LEVEL>","ts":' - built once per level name
+_level_prefixes: dict[str, str] = {}
+
+
+def _get_level_prefix(level_name: str) -> str:
+    prefix = _level_prefixes.get(level_name)
+    if prefix is None:
+        prefix = '{"level":' + _encode_str(level_name) + ',"ts":'
+        _level_prefixes[level_name] = prefix
+    return prefix
+
+
+def _encode_value(value) -> str:
+    if isinstance(value, str):
+        return _encode_str(value)
+    return json.dumps(value, default=str)
+
+
+def format_json_event(level_name: str, message, method: str = None, headers: list = None,
+                      error: BaseException = None, with_traceback: bool = True, ts: float = None) -> str:
+    """
+    :param message: str, or any JSON serializable value (non-serializable values are converted with str)
+    :param error: exception to describe in the "exc" field
+    :param with_traceback: add the current traceback (traceback.format_exc()) to the "exc" field
+    :return: the event as a single line JSON object (no trailing new line)
+    """
+    parts = [_get_level_prefix(level_name), '%.3f' % (ts if ts is not None else time()),
+             ',"msg":', _encode_value(message)]
+    if method is not None:
+        parts.append(',"method":')
+        parts.append(_encode_str(method))
+    if headers:
+        parts.append(',"headers":')
+        parts.append(_encode_value([str(header) for header in headers]))
+    if error is not None:
+        parts.append(',"exc":{"type":')
+        parts.append(_encode_str(type(error).__name__))
+        parts.append(',"repr":')
+        parts.append(_encode_str(repr(error)))
+        if with_traceback:
+            parts.append(',"traceback":')
+            parts.append(_encode_str(traceback.format_exc()))
+        parts.append('}')
+    parts.append('}')
+    return ''.join(parts)
@@ -16,7 +16,7 @@ class Doc:
 
 
     def show_filtered_fields(self, properties: ConfigParser, filter_column: str|None, filter_value: str|None):
-        self.logger.show_debug_log(' - filter: ' + str(filter_column) + ' = ' + str(filter_value))
+        self.logger.show_debug_log(' - filter: {} = {}', filter_column, filter_value)
         sections = properties.sections()
         if len(sections) == 0 or filter_column is not None and len(sections) == 1:
             self.logger.show_log("No properties found in the file")
@@ -27,7 +27,7 @@ class Doc:
         output_array = [sections]
         for k in properties_names:
             if filter_column is not None and properties[filter_column][k].lower() != filter_value:
-                self.logger.show_debug_log(' - skipping ' + k)
+                self.logger.show_debug_log(' - skipping {}', k)
                 self.logger.show_debug_log('')
                 continue
             new_row = []
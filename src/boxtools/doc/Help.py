@@ -29,16 +29,16 @@ class Help:
         output += new_line()
         output += '# Help'
         output += new_line()
-        self.logger.show_debug_log(' - iterating over groups (' + str(len(self.groups)) + ')')
+        self.logger.show_debug_log(' - iterating over groups ({})', len(self.groups))
         for group in self.groups:
             output += new_line()
-            self.logger.show_debug_log(' - group: ' + group)
+            self.logger.show_debug_log(' - group: {}', group)
             # Group name
             output += '[' + group + ']'
             # Group content
-            self.logger.show_debug_log('  - iterating over filtered entries of group: ' + group)
+            self.logger.show_debug_log('  - iterating over filtered entries of group: {}', group)
             for entry in filter(lambda e: e.help_entry_group is group, self.entries):
-                self.logger.show_debug_log('   - entry: ' + str(entry.help_entry_names))
+                self.logger.show_debug_log('   - entry: {}', entry.help_entry_names)
                 output += entry.get_text(indent)
             self.logger.show_debug_log('  - end of iteration')
             output += new_line()
@@ -64,7 +64,7 @@ def ping(host, show_log=True, package_count=1):
 def mk_dir(output_path: PurePath, new_folder: str):
     new_full_path = str(output_path) + get_path_separator() + new_folder
     logger: LogDisplay = LogDisplay().get_log_display()
-    logger.show_debug_log('mk_dir: ' + new_full_path)
+    logger.show_debug_log('mk_dir: {}', new_full_path)
     if not os.path.exists(new_full_path):
         os.mkdir(new_full_path)
         logger.show_info_log("\n - Folder did not exist. Path created ( " + str(new_full_path) + " )")
@@ -11,7 +11,7 @@ DELAY_BETWEEN_LOGS = 3
 def multithread_starmap(data, method, subprocess=False):
     log_display: LogDisplay = LogDisplay().get_log_display()
     pool_size = len(data)
-    log_display.show_debug_log(' - data to process: ' + str(data))
+    log_display.show_debug_log(' - data to process: {}', data)
     if not subprocess:
         log_display.show_debug_log(' - Creating processes pool')
     process_pool = Pool(pool_size)
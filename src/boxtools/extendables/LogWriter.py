@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+import atexit
+import glob
+import gzip
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from queue import Queue, Empty, Full
+from threading import Thread, Event, Lock
+from time import monotonic, time
+
+
+class QueueFullPolicy:
+    # Caller waits until the writer thread made room in the queue
+    BLOCK = 'block'
+    # Line is silently discarded
+    DROP = 'drop'
+    # Line is discarded, and the number of discarded lines is written to the log file once the queue has room again
+    COUNT = 'count'
+
+
+class LogRotation:
+    """
+    Log rotation policy: a log file is rotated once it reaches max_bytes, and/or once its current segment is interval
+    seconds old (from the previous rotation, whatever the writes in between, or from the first write). Rotated segments are renamed <log file>.<timestamp> (gzip-compressed in the background if
+    compress), and only the backup_count most recent ones are kept.
+    """
+    def __init__(self, max_bytes: int = None, interval: float = None, backup_count: int = 5, compress: bool = True):
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+
+
+_SEGMENT_SUFFIX_FORMAT = '%Y%m%d-%H%M%S-%f'
+_SEGMENT_SUFFIX_PATTERN = re.compile(r'\.\d{8}-\d{6}-\d{6}(\.gz)?')
+
+# Compression & cleanup of rotated segments, out of the logging call path. Pending jobs are completed at exit.
+_archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='LogArchiver')
+
+
+def _get_segments(log_file_path: str) -> list[str]:
+    # timestamp suffixes sort chronologically
+    return sorted(path for path in glob.glob(glob.escape(log_file_path) + '.*')
+                  if _SEGMENT_SUFFIX_PATTERN.fullmatch(path[len(log_file_path):]))
+
+
+def _get_last_rotation_time(log_file_path: str) -> float | None:
+    """
+    :return: time of the last rotation of log_file_path (read from its newest segment name), None if never rotated
+    """
+    segments = _get_segments(log_file_path)
+    if not segments:
+        return None
+    suffix = segments[-1][len(log_file_path) + 1:].removesuffix('.gz')
+    try:
+        return datetime.strptime(suffix, _SEGMENT_SUFFIX_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def _archive_segment(log_file_path: str, segment_path: str, rotation: LogRotation):
+    if rotation.compress:
+        with open(segment_path, 'rb') as f_in, gzip.open(segment_path + '.gz.tmp', 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.replace(segment_path + '.gz.tmp', segment_path + '.gz')
+        os.remove(segment_path)
+    segments = _get_segments(log_file_path)
+    for old_segment in segments[:max(0, len(segments) - rotation.backup_count)]:
+        os.remove(old_segment)
+
+
+class _LogFileHandle:
+    __slots__ = ('file', 'inode', 'last_used', 'size')
+
+    def __init__(self, file, inode: int, last_used: float, size: int):
+        self.file = file
+        self.inode = inode
+        self.last_used = last_used
+        self.size = size
+
+
+class LogWriter:
+    """
+    Appends log lines to files through one persistent handle per file path.
+    Same contract as fileAccess.append_to_file: each content is written as '\\n' + content,
+    and nothing is written to a file that doesn't exist (files are never created here).
+    Every check_interval seconds, handles unused for idle_timeout seconds are closed, as well as handles whose
+    file was deleted or replaced (e.g. rotated): the next write reopens the path.
+    Files are rotated according to rotation, if set (sizes are counted in characters).
+    """
+    def __init__(self, idle_timeout: float = 300.0, check_interval: float = 10.0, rotation: LogRotation = None):
+        self.handles: dict[str, _LogFileHandle] = {}
+        self.lock = Lock()
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.rotation = rotation
+        # log file path -> time (time()) its current segment started: kept when handles are closed
+        self.segment_starts: dict[str, float] = {}
+        self._next_check: float = monotonic() + check_interval
+
+    def write(self, log_file_path, content: str) -> bool:
+        with self.lock:
+            return self._write(log_file_path, content)
+
+    def flush(self):
+        with self.lock:
+            self._flush_handles()
+
+    def close(self):
+        with self.lock:
+            self._close_handles()
+
+    def _write(self, log_file_path, content: str) -> bool:
+        if log_file_path is None:
+            return False
+        now = monotonic()
+        if now >= self._next_check:
+            self._check_handles(now)
+        log_file_path = os.fspath(log_file_path)
+        handle = self._get_handle(log_file_path, now)
+        if handle is None:
+            return False
+        line = '\n' + content
+        handle.file.write(line)
+        handle.last_used = now
+        handle.size += len(line)
+        if self.rotation is not None and self._is_rotation_due(log_file_path, handle):
+            self._rotate(log_file_path)
+        return True
+
+    def _is_rotation_due(self, log_file_path: str, handle: _LogFileHandle) -> bool:
+        rotation = self.rotation
+        return ((rotation.max_bytes is not None and handle.size >= rotation.max_bytes)
+                or (rotation.interval is not None
+                    and time() - self._get_segment_start(log_file_path) >= rotation.interval))
+
+    def _get_segment_start(self, log_file_path: str) -> float:
+        segment_start = self.segment_starts.get(log_file_path)
+        if segment_start is None:
+            # First write of this process: the segment started at the last rotation, if any (e.g. before a restart)
+            segment_start = _get_last_rotation_time(log_file_path) or time()
+            self.segment_starts[log_file_path] = segment_start
+        return segment_start
+
+    def _rotate(self, log_file_path: str):
+        # Only renames happen here: compression & cleanup are left to the archive thread
+        self._close_handle(log_file_path)
+        rotation_time = datetime.now()
+        segment_path = '{}.{}'.format(log_file_path, rotation_time.strftime(_SEGMENT_SUFFIX_FORMAT))
+        os.replace(log_file_path, segment_path)
+        open(log_file_path, 'a').close()
+        self.segment_starts[log_file_path] = rotation_time.timestamp()
+        _archive_executor.submit(_archive_segment, log_file_path, segment_path, self.rotation)
+
+    def _get_handle(self, log_file_path: str, now: float) -> _LogFileHandle | None:
+        handle = self.handles.get(log_file_path)
+        if handle is None:
+            if not os.path.exists(log_file_path):
+                return None
+            file = open(log_file_path, 'a', encoding='utf-8')
+            st = os.fstat(file.fileno())
+            handle = _LogFileHandle(file, st.st_ino, now, st.st_size)
+            self.handles[log_file_path] = handle
+        return handle
+
+    def _check_handles(self, now: float):
+        self._next_check = now + self.check_interval
+        for log_file_path, handle in list(self.handles.items()):
+            try:
+                is_stale = os.stat(log_file_path).st_ino != handle.inode
+            except OSError:
+                is_stale = True
+            if is_stale or now - handle.last_used >= self.idle_timeout:
+                self._close_handle(log_file_path)
+
+    def _close_handle(self, log_file_path: str):
+        handle = self.handles.pop(log_file_path)
+        try:
+            handle.file.close()
+        except OSError:
+            pass
+
+    def _flush_handles(self):
+        for handle in self.handles.values():
+            handle.file.flush()
+
+    def _close_handles(self):
+        for log_file_path in list(self.handles):
+            self._close_handle(log_file_path)
+
+
+class AsyncLogWriter(LogWriter):
+    """
+    LogWriter running in a background thread: write() only enqueues the line and returns.
+    Files are flushed every flush_interval seconds, and the queue is drained on close() (registered at exit).
+    A line that fails to be written is counted in error_count (last error in last_error) and skipped.
+    """
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, max_queue_size: int = 10000, flush_interval: float = 1.0,
+                 queue_full_policy: str = QueueFullPolicy.BLOCK, idle_timeout: float = 300.0,
+                 rotation: LogRotation = None):
+        super().__init__(idle_timeout=idle_timeout, check_interval=flush_interval, rotation=rotation)
+        self.queue: Queue = Queue(maxsize=max_queue_size)
+        self.flush_interval = flush_interval
+        self.queue_full_policy = queue_full_policy
+        self.dropped_count: int = 0
+        self.error_count: int = 0
+        self.last_error: BaseException | None = None
+        self._pending_dropped: dict[str, int] = {}
+        self._dropped_lock = Lock()
+        self._closed = False
+        self.thread = Thread(target=self._run, name='AsyncLogWriter', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def is_running(self) -> bool:
+        return not self._closed and self.thread.is_alive()
+
+    def write(self, log_file_path, content: str) -> bool:
+        if not self.is_running():
+            return super().write(log_file_path, content)
+        if self.queue_full_policy == QueueFullPolicy.BLOCK:
+            self.queue.put((log_file_path, content))
+            return True
+        try:
+            self.queue.put_nowait((log_file_path, content))
+            return True
+        except Full:
+            self.dropped_count += 1
+            if self.queue_full_policy == QueueFullPolicy.COUNT and log_file_path is not None:
+                path = os.fspath(log_file_path)
+                with self._dropped_lock:
+                    self._pending_dropped[path] = self._pending_dropped.get(path, 0) + 1
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every line queued so far is written and flushed
+        :return: False if timeout expired first
+        """
+        if not self.is_running():
+            super().flush()
+            return True
+        done = Event()
+        self.queue.put((self._FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = None):
+        """
+        Drain the queue, then close every file. Later writes are done synchronously
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self.thread.is_alive():
+            self.queue.put((self._STOP, None))
+            self.thread.join(timeout)
+        if not self.thread.is_alive():
+            super().close()
+
+    def _run(self):
+        next_flush = monotonic() + self.flush_interval
+        while True:
+            try:
+                item, value = self.queue.get(timeout=max(0.0, next_flush - monotonic()))
+            except Empty:
+                item = value = None
+            with self.lock:
+                if item is self._STOP:
+                    self._safe_call(self._write_dropped_counts)
+                    self._safe_call(self._close_handles)
+                    return
+                if item is self._FLUSH:
+                    self._safe_call(self._write_dropped_counts)
+                    self._safe_call(self._flush_handles)
+                    value.set()
+                elif item is not None:
+                    self._safe_call(self._write, item, value)
+                if monotonic() >= next_flush:
+                    self._safe_call(self._write_dropped_counts)
+                    self._safe_call(self._flush_handles)
+                    next_flush = monotonic() + self.flush_interval
+
+    def _safe_call(self, method, *args):
+        # The writer thread must survive any failing line, or BLOCK callers would wait forever
+        try:
+            method(*args)
+        except Exception as e:
+            self.error_count += 1
+            self.last_error = e
+
+    def _write_dropped_counts(self):
+        if self._pending_dropped:
+            with self._dropped_lock:
+                pending_dropped = self._pending_dropped
+                self._pending_dropped = {}
+            for path, count in pending_dropped.items():
+                self._write(path, '[AsyncLogWriter] {} log line(s) dropped: queue was full'.format(count))
+
+
+_async_log_writer: AsyncLogWriter | None = None
+
+
+def get_async_log_writer() -> AsyncLogWriter:
+    """
+    :return: the process-wide AsyncLogWriter (started on first call)
+    """
+    global _async_log_writer
+    if _async_log_writer is None or not _async_log_writer.is_running():
+        _async_log_writer = AsyncLogWriter()
+    return _async_log_writer
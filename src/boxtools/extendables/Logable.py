@@ -2,30 +2,63 @@
 import traceback
 from datetime import datetime
 from pathlib import PurePath
+from time import time, localtime, strftime
 
-from boxtools.data.util.dateUtils import get_date_str, get_hour_str
+from boxtools.data.util.dateUtils import get_date_str
+from boxtools.data.util.jsonLogUtils import format_json_event
 from boxtools.data.access.fileAccess import append_to_file
+from boxtools.extendables.LogWriter import LogWriter, LogRotation
 
 
 class Logable:
-    def __init__(self, log_file_path: str, unit_test_mode: bool = False):
+    def __init__(self, log_file_path: str, unit_test_mode: bool = False, writer: LogWriter = None,
+                 rotation: LogRotation = None, structured: bool = False):
+        """
+        :param writer: if set, log lines go through it instead of opening & closing the log file for each line.
+        Use boxtools.extendables.LogWriter.get_async_log_writer() for non-blocking logging
+        :param rotation: size/time based rotation of the log files. Ignored if writer is set
+        (configure the writer's rotation instead): a dedicated LogWriter is created otherwise
+        :param structured: write one JSON object per event (see jsonLogUtils.format_json_event) instead of text lines
+        """
         self.log_file_path: str = log_file_path
         self.unit_test_mode: bool = unit_test_mode
+        self.structured: bool = structured
+        if writer is None and rotation is not None:
+            writer = LogWriter(rotation=rotation)
+        self.writer: LogWriter | None = writer
+        self._hour_second: int = -1
+        self._hour_str: str = ''
 
     def log(self, content: str, log_file_path: str = None):
+        if self.structured:
+            content = format_json_event('INFO', content)
+        self._emit(content, log_file_path)
+
+    def _emit(self, line: str, log_file_path: str = None):
         if self.unit_test_mode:
-            print(content)
+            print(line)
         else:
             if log_file_path is not None and len(log_file_path.strip()) > 0:
                 self.log(f'log -- forced log_file_path :: {log_file_path}')
-                append_to_file(log_file_path, content)
+                self._append(log_file_path, line)
             else:
-                append_to_file(self.log_file_path, content)
+                self._append(self.log_file_path, line)
+
+    def _append(self, log_file_path, content: str):
+        if self.writer is not None:
+            self.writer.write(log_file_path, content)
+        else:
+            append_to_file(log_file_path, content)
 
     def log_error(self, error, method_name: str, error_type: str = None,
                   log_file_path: str = None,
                   show_details: bool = True):
         c_error_type: str = ' #{}'.format(error_type) if error_type is not None else ''
+        if self.structured:
+            self._emit(format_json_event('ERROR', 'Error on {}(){}'.format(method_name, c_error_type),
+                                         method=method_name, error=error, with_traceback=show_details),
+                       log_file_path)
+            return
         if self.unit_test_mode:
             print('/!\\ Error on {}(){}: {}'.format(method_name, c_error_type, repr(error)))
             print('- Error details: {}'.format(traceback.format_exc()))
@@ -37,13 +70,24 @@ class Logable:
                          log_file_path=log_file_path)
 
     def tlog(self, content: str, headers: list = None, log_file_path: str = None):
-        f_content: str = '[{}'.format(get_hour_str(datetime.now()))
-        for header in headers:
+        if self.structured:
+            self._emit(format_json_event('INFO', content, headers=headers), log_file_path)
+            return
+        f_content: str = '[{}'.format(self._get_hour_str())
+        for header in headers or []:
             f_content += ' - {}'.format(header)
         f_content += '] {}'.format(content)
         self.log(content=f_content,
                  log_file_path=log_file_path)
 
+    def _get_hour_str(self) -> str:
+        # Same as get_hour_str(datetime.now()), formatted once per second only
+        now: int = int(time())
+        if now != self._hour_second:
+            self._hour_second = now
+            self._hour_str = strftime('%H:%M:%S', localtime(now))
+        return self._hour_str
+
     def change_log_file_path(self, log_file_path: str):
         self.log_file_path = log_file_path
 
@@ -77,12 +77,18 @@ class IniEditor(tk.Frame):
         s_view.create()
 
     def save_settings(self):
+        # One change set per settings file, so that each file is written (at most) once
+        changes = {}
         for entry in self.settings_entries:
             field = entry[0]
             value = entry[1].get() if callable(getattr(entry[1], "get", None)) else str('selected' in entry[1].state())
             if field.settings_instance:
                 settings = field.settings_instance
-                settings.apply_single_setting_change(field.property_section, field.property_name, value)
+                if id(settings) not in changes:
+                    changes[id(settings)] = (settings, settings.get_settings_change())
+                changes[id(settings)][1].add_property_change(field.property_section, field.property_name, value)
+        for settings, change in changes.values():
+            settings.apply_settings_change(change)
 
     def show_save_action_frame(self):
         buttons_frame = Frame(self)
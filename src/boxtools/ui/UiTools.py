@@ -84,7 +84,7 @@ def strip_colours(text, log_level):
     for color_name, color in color_vars.items():
         if not color_name.startswith('__'):
             if color in text:
-                log.show_debug_log('color found: ' + color + ' (' + color_name + ')')
+                log.show_debug_log('color found: {} ({})', color, color_name)
                 text = text.replace(color, '')
-    log.show_debug_log('\ntext: ' + text)
+    log.show_debug_log('\ntext: {}', text)
     return text
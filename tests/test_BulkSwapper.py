@@ -0,0 +1,95 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from boxtools.Logs import LogDisplay, set_log_display_override
+from boxtools.data.swapper.bulkSwapper import find_files, bulk_update_files, bulk_remove_lines_by_content, \
+    bulk_expand_tabs, POOL_MIN_FILES
+
+
+class TestBulkSwapper(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = self.tmp_dir.name
+        set_log_display_override(LogDisplay())
+        self.addCleanup(set_log_display_override, None)
+        self.files = {'A.java': 'class A extends Old {}\n', 'pkg/B.java': 'class B {}\n',
+                      'pkg/C.java': 'Old o;\nOld p;\n', 'pkg/notes.txt': 'Old\n', 'target/D.java': 'Old\n'}
+        for name, content in self.files.items():
+            os.makedirs(os.path.dirname(self._path(name)), exist_ok=True)
+            with open(self._path(name), 'w') as f:
+                f.write(content)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _read(self, name: str) -> str:
+        with open(self._path(name)) as f:
+            return f.read()
+
+    def test_find_files(self):
+        assert find_files(self.root, ['*.java'], ['target']) == \
+            [self._path('A.java'), self._path('pkg/B.java'), self._path('pkg/C.java')]
+
+    def test_update(self):
+        report = bulk_update_files(self.root, {'Old': 'New'}, ['*.java'], ['target'], processes=1)
+        assert report.files_scanned == 3 and report.files_matched == 2
+        assert report.changes == {self._path('A.java'): 1, self._path('pkg/C.java'): 2}
+        assert self._read('pkg/C.java') == 'New o;\nNew p;\n'
+        assert self._read('target/D.java') == 'Old\n'
+
+    def test_update_in_pool(self):
+        # enough files for the pool to be used (POOL_MIN_FILES)
+        os.makedirs(self._path('many'))
+        for i in range(POOL_MIN_FILES):
+            with open(self._path('many/E{}.java'.format(i)), 'w') as f:
+                f.write('Old e{};\n'.format(i))
+        report = bulk_update_files(self.root, {'Old': 'New'}, processes=2)
+        report_files = sorted(os.path.relpath(path, self.root) for path in report.changes)
+        assert len(report_files) == POOL_MIN_FILES + 4
+        assert report_files[:4] == ['A.java', 'many/E0.java', 'many/E1.java', 'many/E10.java']
+        assert self._read('many/E31.java') == 'New e31;\n'
+
+    def test_undecodable_file_is_skipped(self):
+        with open(self._path('pkg/b.bin'), 'wb') as f:
+            f.write(b'\xff\xfe Old \x00')
+        report = bulk_update_files(self.root, {'Old': 'New'}, processes=1)
+        assert list(report.errors) == [self._path('pkg/b.bin')]
+        assert self._read('target/D.java') == 'New\n'
+        with open(self._path('pkg/b.bin'), 'rb') as f:
+            assert f.read() == b'\xff\xfe Old \x00'
+
+    def test_dry_run_remove(self):
+        report = bulk_remove_lines_by_content(self.root, ['Old o'], ['*.java'], dry_run=True, processes=1)
+        assert report.changes == {self._path('pkg/C.java'): 1}
+        assert '-Old o;\n' in report.diffs[self._path('pkg/C.java')]
+        assert self._read('pkg/C.java') == self.files['pkg/C.java']
+
+    def test_expand_tabs(self):
+        with open(self._path('pkg/Tabs.JAVA'), 'wb') as f:
+            f.write(b'class T {\n\tint\ti;\n}\n')
+        changed, errors = bulk_expand_tabs(self.root, ['*.java'], processes=1)
+        assert changed == [self._path('pkg/Tabs.JAVA')] and errors == {}
+        with open(self._path('pkg/Tabs.JAVA'), 'rb') as f:
+            assert f.read() == b'class T {\n    int i;\n}\n'
+
+    def test_single_file_and_unreadable_directory(self):
+        assert find_files(self._path('pkg/C.java'), ['*.JAVA'], ignore_case=True) == [self._path('pkg/C.java')]
+        assert find_files(self._path('pkg/notes.txt'), ['*.java']) == []
+        with open(self._path('pkg/Tabs.java'), 'w') as f:
+            f.write('\tint i;\n')
+        changed, errors = bulk_expand_tabs(self._path('pkg/Tabs.java'), ['*.java'], processes=1)
+        assert changed == [self._path('pkg/Tabs.java')] and errors == {}
+        scandir = os.scandir
+
+        def failing_scandir(path):
+            if path == self._path('target'):
+                raise PermissionError(13, 'Permission denied', path)
+            return scandir(path)
+
+        with patch('os.scandir', failing_scandir):
+            changed, errors = bulk_expand_tabs(self.root, ['*.java'], processes=1)
+        assert list(errors) == [self._path('target')]
@@ -0,0 +1,195 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from boxtools.data.swapper.fileContentSwapper import update_file, ReplaceRuleSet, update_line, add_line, \
+    prepend_to_lines, get_lines_by_yml_paths, get_line_by_yml_hierarchy, update_yml_values, find_lines_by_texts, \
+    find_lines_by_text, append_to_line, remove_lines_by_content, add_lines
+from boxtools.data.swapper.FileEditSession import FileEditSession
+from boxtools.data.swapper.LineIndex import get_line_index
+
+
+class TestUpdateFile(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, 'file.txt')
+
+    def _update(self, content: str, replace_map, **kwargs) -> str:
+        with open(self.file_path, 'w') as f:
+            f.write(content)
+        update_file(self.file_path, replace_map, **kwargs)
+        with open(self.file_path) as f:
+            return f.read()
+
+    def test_prefix_and_substring_rules(self):
+        content = 'version=1\nname: foo\nother foo bar\n'
+        assert self._update(content, {'version=.*': 'version=2', 'foo': 'baz'}) == \
+            'version=2\nname: baz\nother baz bar\n'
+
+    def test_rules_match_the_original_line(self):
+        # 'b' is looked for in the original line, but replaced in the already updated one
+        assert self._update('a\n', {'a': 'b', 'b': 'c'}) == 'b\n'
+        assert self._update('ab\n', {'a': 'b', 'b': 'c'}) == 'cc\n'
+
+    def test_if_not_exist_and_is_append(self):
+        assert self._update('key value\nkey\n', {'key': ' value'}, if_not_exist=True, is_append=True) == \
+            'key value\nkey value\n'
+
+    def test_rule_set_is_reusable(self):
+        rule_set = ReplaceRuleSet({'x.*': 'y', '.': '!'})
+        assert self._update('x.1\nz.2\nw\n', rule_set) == 'y\nz!2\nw\n'
+        assert not rule_set.is_candidate('w\n')
+
+
+class TestStreamingEdits(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, 'file.txt')
+        with open(self.file_path, 'w') as f:
+            f.write('a\nb\nc\n')
+
+    def _read(self) -> str:
+        with open(self.file_path) as f:
+            return f.read()
+
+    def test_line_edits(self):
+        update_line(self.file_path, -1, 'z')
+        add_line(self.file_path, 1, 'x')
+        add_line(self.file_path, 1, 'x', no_duplicate=True)
+        prepend_to_lines(self.file_path, [0, 0], '>')
+        assert self._read() == '>>a\nx\nb\nz\n'
+
+    def test_line_index(self):
+        line_index = get_line_index(self.file_path)
+        assert list(line_index.newlines) == [1, 3, 5] and line_index.get_line_count() == 3
+        append_to_line(self.file_path, 1, 'x')
+        assert self._read() == 'a\nb\nxc\n'
+        assert list(get_line_index(self.file_path).newlines) == [1, 3, 6]
+
+    def test_crlf_file_is_edited_as_text(self):
+        with open(self.file_path, 'wb') as f:
+            f.write(b'a\r\nb\r\n')
+        update_line(self.file_path, 0, 'z')
+        with open(self.file_path, 'rb') as f:
+            assert f.read() == b'z\nb\n'
+
+    def test_failed_edit_leaves_file_untouched(self):
+        with self.assertRaises(IndexError):
+            update_line(self.file_path, 3, 'z')
+        assert self._read() == 'a\nb\nc\n'
+        assert os.listdir(self.tmp_dir.name) == ['file.txt']
+
+
+class TestFileEditSession(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, 'File.java')
+        with open(self.file_path, 'w') as f:
+            f.write('package a;\n\nclass A {\n    int i;\n    int j;\n}\n')
+
+    def test_edits_use_original_line_numbers(self):
+        with FileEditSession(self.file_path) as session:
+            session.insert(2, 'import b.B;')
+            session.insert(3, 'int', no_duplicate=True)
+            session.comment_text('int j')
+            session.comment(3)
+            session.comment(3)
+            session.replace(-1, '}  // A')
+            session.delete(1)
+        with open(self.file_path) as f:
+            assert f.read() == 'package a;\nimport b.B;\nclass A {\n//    int i;\n//    int j;\n}  // A\n'
+
+    def test_reused_session_matches_readlines(self):
+        with open(self.file_path, 'w') as f:
+            f.write('int a;\x0c int b;\nint c;\u2028 int d;\n')
+        session = FileEditSession(self.file_path)
+        # match_cnt 0: every matching line, as prepend_to_line_by_text
+        session.comment_text('int', match_cnt=0)
+        session.commit()
+        with open(self.file_path) as f:
+            assert session.lines == f.readlines()
+        session.replace(1, 'int e;')
+        session.commit()
+        with open(self.file_path) as f:
+            assert f.read() == '//int a;\x0c int b;\nint e;\n'
+
+    def test_no_edit_no_write(self):
+        mtime = os.stat(self.file_path).st_mtime_ns
+        assert not FileEditSession(self.file_path).commit()
+        assert os.stat(self.file_path).st_mtime_ns == mtime
+
+
+class TestYmlPathIndex(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, 'application.yml')
+        with open(self.file_path, 'w') as f:
+            f.write('spring:\n    datasource:\n        url: jdbc:h2:mem  # db\n'
+                    'items:\n  - name: a\nserver:\n  port: 8080\n')
+
+    def test_lookups(self):
+        assert get_lines_by_yml_paths(self.file_path, ['spring.datasource.url', 'server.port', 'items.name']) == \
+            {'spring.datasource.url': 2, 'server.port': 6, 'items.name': None}
+        assert get_line_by_yml_hierarchy(self.file_path, ['server', 'port']) == 6
+        # legacy prefix matching
+        assert get_line_by_yml_hierarchy(self.file_path, ['serv']) == 5
+
+    def test_batch_update(self):
+        assert update_yml_values(self.file_path, {'spring.datasource.url': 'x', 'server.port': '9090',
+                                                  'server.host': 'h'}) == ['server.host']
+        with open(self.file_path) as f:
+            assert f.read() == 'spring:\n    datasource:\n        url: x\nitems:\n  - name: a\nserver:\n  port: 9090\n'
+        assert get_lines_by_yml_paths(self.file_path, ['server.port']) == {'server.port': 6}
+
+
+class TestFindLinesByTexts(TestCase):
+
+    def test_many_texts_in_one_pass(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'A.java')
+            with open(file_path, 'w') as f:
+                f.write('package a;\nimport b.B;\nimport c.C;\nclass A {\n}\n')
+            assert find_lines_by_texts(file_path, ['import', 'class', 'B;', 'enum']) == \
+                {'import': [1, 2], 'class': [3], 'B;': [1], 'enum': []}
+            assert find_lines_by_texts(file_path, ['import', '}'], stop_on_first=True) == {'import': [1], '}': [4]}
+            assert find_lines_by_text(file_path, 'C;') == [2]
+
+
+class TestRemoveLinesByContent(TestCase):
+
+    def test_removed_lines(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'conf.txt')
+            with open(file_path, 'w') as f:
+                f.write('a=1\n#MARK\nb=2\n#MARK\n#TODO x\n')
+            assert remove_lines_by_content(file_path, ['#MARK', 'TODO'], with_removed_lines=True) == \
+                {'#MARK': 2, '#TODO x': 1}
+            assert remove_lines_by_content(file_path, ['#MARK']) == 0
+            with open(file_path) as f:
+                assert f.read() == 'a=1\nb=2\n'
+
+
+class TestAddLines(TestCase):
+
+    def _add_lines(self, nb_lines: int, **kwargs) -> str:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'file.txt')
+            with open(file_path, 'w') as f:
+                f.write('0\n1\n2\n3\n4')
+            add_lines(file_path, nb_lines, '-', **kwargs)
+            with open(file_path) as f:
+                return f.read()
+
+    def test_default_starts_after_first_line(self):
+        assert self._add_lines(2) == '0\n-\n1\n2\n-\n3\n4\n-\n'
+
+    def test_start_offset(self):
+        assert self._add_lines(2, start_offset=1) == '0\n1\n-\n2\n3\n-\n4'
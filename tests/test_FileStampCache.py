@@ -0,0 +1,49 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from boxtools.data.util.FileStampCache import FileStampCache
+
+
+class TestFileStampCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'a.txt')
+        self._write(self.path, 'one')
+        self.cache = FileStampCache(self._load)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def _write(path: str, content: str):
+        with open(path, 'w') as f:
+            f.write(content)
+
+    @staticmethod
+    def _load(path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    def test_hit_until_replaced(self):
+        link = os.path.join(self.tmp_dir.name, 'link.txt')
+        os.symlink(self.path, link)
+        assert self.cache.get(self.path) == 'one'
+        assert self.cache.get(link) == 'one'
+        assert self.cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+        # same size, and possibly the same mtime: only the inode tells the file changed
+        other = os.path.join(self.tmp_dir.name, 'b.txt')
+        self._write(other, 'two')
+        os.utime(other, ns=(os.stat(self.path).st_atime_ns, os.stat(self.path).st_mtime_ns))
+        os.replace(other, self.path)
+        assert self.cache.get(self.path) == 'two'
+
+    def test_put_and_invalidate(self):
+        self.cache.put(self.path, 'computed')
+        assert self.cache.get(self.path) == 'computed'
+        self.cache.invalidate(self.path)
+        assert self.cache.get(self.path) == 'one'
+        with self.assertRaises(OSError):
+            self.cache.get(os.path.join(self.tmp_dir.name, 'missing.txt'))
+        assert self.cache.stats()['entries'] == 1
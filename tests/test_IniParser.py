@@ -0,0 +1,130 @@
+import os
+import tempfile
+from configparser import ConfigParser
+from unittest import TestCase
+
+from boxtools.data.dto.ConfigurationChangeDto import ConfigurationChangeDto
+from boxtools.data.parser import iniParser
+from boxtools.data.util.Settings import Settings
+from boxtools.data.util.fileUtils import atomic_open
+
+
+class TestPropertiesCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ini_path = os.path.join(self.tmp_dir.name, 'app.ini')
+        self._write('[SETTINGS]\nLOG_LEVEL = 2\nNAME = box\n')
+        iniParser.invalidate_properties_cache()
+        iniParser.reset_properties_cache_stats()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, content: str):
+        with open(self.ini_path, 'w') as f:
+            f.write(content)
+
+    def test_repeated_reads_hit_cache(self):
+        for _ in range(10):
+            assert iniParser.get_int_property(self.ini_path, 'SETTINGS', 'LOG_LEVEL') == 2
+        stats = iniParser.get_properties_cache_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 9
+
+    def test_file_change_invalidates(self):
+        assert iniParser.get_string_property(self.ini_path, 'SETTINGS', 'NAME') == 'box'
+        self._write('[SETTINGS]\nLOG_LEVEL = 3\nNAME = other box\n')
+        assert iniParser.get_string_property(self.ini_path, 'SETTINGS', 'NAME') == 'other box'
+        assert iniParser.get_properties_cache_stats()['misses'] == 2
+
+    def test_bypass_cache(self):
+        iniParser.get_properties(self.ini_path)
+        config = iniParser.get_properties(self.ini_path, use_cache=False)
+        assert config is not iniParser.get_properties(self.ini_path)
+        assert iniParser.get_properties_cache_stats()['misses'] == 1
+
+    def test_missing_file_is_not_cached(self):
+        missing_path = os.path.join(self.tmp_dir.name, 'missing.ini')
+        assert iniParser.get_properties(missing_path).sections() == []
+        assert not iniParser.has_property(missing_path, 'SETTINGS', 'LOG_LEVEL')
+        assert iniParser.get_properties_cache_stats()['entries'] == 0
+
+
+class TestSettingsTransaction(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ini_path = os.path.join(self.tmp_dir.name, 'user.ini')
+        with open(self.ini_path, 'w') as f:
+            f.write('[SETTINGS]\nlog_level = 2\nname = box\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_transaction_writes_once(self):
+        settings = Settings(self.ini_path)
+        with settings.settings_transaction() as change:
+            change.add_property_change('SETTINGS', 'log_level', '3')
+            change.add_property_change('SETTINGS', 'name', 'other box')
+        assert settings.get_int_setting('SETTINGS', 'log_level') == 3
+        assert settings.get_string_setting('SETTINGS', 'name') == 'other box'
+        assert os.listdir(self.tmp_dir.name) == ['user.ini']
+
+    def test_unchanged_values_skip_write(self):
+        settings = Settings(self.ini_path)
+        before = os.stat(self.ini_path).st_mtime_ns
+        change = settings.get_settings_change()
+        change.add_property_change('SETTINGS', 'name', 'box')
+        assert not settings.apply_settings_change(change)
+        assert os.stat(self.ini_path).st_mtime_ns == before
+
+    def test_failed_transaction_keeps_file(self):
+        settings = Settings(self.ini_path)
+        with self.assertRaises(RuntimeError):
+            with settings.settings_transaction() as change:
+                change.add_property_change('SETTINGS', 'name', 'lost')
+                raise RuntimeError('interrupted')
+        assert settings.get_string_setting('SETTINGS', 'name') == 'box'
+
+    def test_symlinked_ini_target_is_updated(self):
+        link_path = os.path.join(self.tmp_dir.name, 'link.ini')
+        os.symlink(self.ini_path, link_path)
+        Settings(link_path).apply_single_setting_change('SETTINGS', 'name', 'through link')
+        assert os.path.islink(link_path)
+        assert Settings(self.ini_path).get_string_setting('SETTINGS', 'name') == 'through link'
+
+    def test_new_file_mode_follows_umask(self):
+        new_path = os.path.join(self.tmp_dir.name, 'new.ini')
+        with atomic_open(new_path) as f:
+            f.write('[SETTINGS]\n')
+        umask = os.umask(0o022)
+        os.umask(umask)
+        assert os.stat(new_path).st_mode & 0o777 == 0o666 & ~umask
+        assert sorted(os.listdir(self.tmp_dir.name)) == ['new.ini', 'user.ini']
+
+
+class TestConfigurationChangeDto(TestCase):
+
+    def test_changes_are_per_instance(self):
+        first = ConfigurationChangeDto('first.ini')
+        first.add_property_change('SETTINGS', 'name', 'box')
+        second = ConfigurationChangeDto('second.ini')
+        assert len(first) == 1
+        assert second.get_changes() == []
+
+    def test_later_change_wins(self):
+        change = ConfigurationChangeDto('app.ini')
+        change.add_property_change('SETTINGS', 'LOG_LEVEL', '2')
+        change.add_property_change('SETTINGS', 'log_level', '3')
+        assert len(change) == 1
+        assert change.get_changes()[0].property_value == '3'
+
+    def test_diff_against_current_config(self):
+        config = ConfigParser()
+        config.read_string('[SETTINGS]\nlog_level = 2\nname = box\n')
+        change = ConfigurationChangeDto('app.ini')
+        change.add_property_change('SETTINGS', 'log_level', '2')
+        change.add_property_change('SETTINGS', 'name', 'other box')
+        change.add_property_change('SETTINGS', 'new_option', 'x')
+        assert [c.property_name for c in change.get_diff(config)] == ['name', 'new_option']
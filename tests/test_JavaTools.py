@@ -0,0 +1,212 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from boxtools.Logs import LogDisplay, set_log_display_override
+from boxtools.data.swapper.JavaClassIndex import JavaClassIndex
+from boxtools.data.swapper.JavaCodeEmitter import JavaCodeEmitter
+from boxtools.data.swapper.JavaHeader import get_java_header
+from boxtools.data.swapper.javaTools import JavaTools
+
+
+def write_java_file(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class TestJavaClassIndex(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = os.path.join(self.tmp_dir.name, 'project')
+        self.cache_file = os.path.join(self.tmp_dir.name, 'index.json')
+        write_java_file(os.path.join(self.root, 'src/com/a/Entity.java'), 'package com.a;\nclass Entity {}\n')
+        write_java_file(os.path.join(self.root, 'src/com/b/Entity.java'), 'package com.b;\nclass Entity {}\n')
+        write_java_file(os.path.join(self.root, '.git/Hidden.java'), 'class Hidden {}\n')
+        set_log_display_override(LogDisplay())
+        self.addCleanup(set_log_display_override, None)
+
+    def test_find(self):
+        index = JavaClassIndex(self.root, self.cache_file)
+        assert index.find_all('Entity.java') == [os.path.join(self.root, 'src/com/a/Entity.java'),
+                                                 os.path.join(self.root, 'src/com/b/Entity.java')]
+        assert index.find_by_fqcn('com.b.Entity') == os.path.join(self.root, 'src/com/b/Entity.java')
+        assert index.find('Hidden') is None
+        # default cache file: kept in the test directory
+        with patch('boxtools.data.swapper.JavaClassIndex.get_cache_dir', return_value=self.tmp_dir.name):
+            assert JavaTools.find_project_class('Entity', self.root) == \
+                os.path.join(self.root, 'src/com/a/Entity.java')
+
+    def test_incremental_refresh_and_cache_file(self):
+        index = JavaClassIndex(self.root, self.cache_file)
+        assert not index.refresh()
+        new_path = os.path.join(self.root, 'src/com/a/Other.java')
+        write_java_file(new_path, 'package com.a;\nclass Other {}\n')
+        # refreshed on miss
+        assert index.find('Other') == new_path
+        reloaded = JavaClassIndex(self.root, self.cache_file)
+        assert reloaded.dirs == index.dirs and reloaded.find('Other') == new_path
+
+    def test_planted_cache_is_ignored(self):
+        outside = os.path.join(self.tmp_dir.name, 'outside')
+        write_java_file(os.path.join(outside, 'Planted.java'), 'class Planted {}\n')
+        with open(self.cache_file, 'w') as f:
+            json.dump({'version': 1, 'root': os.path.realpath(self.root),
+                       'dirs': {'': [os.stat(self.root).st_mtime_ns, [], ['..']],
+                                '..': [os.stat(self.tmp_dir.name).st_mtime_ns, [], ['outside']],
+                                os.path.join('..', 'outside'): [os.stat(outside).st_mtime_ns, ['Planted.java'], []]}},
+                      f)
+        index = JavaClassIndex(self.root, self.cache_file)
+        assert index.find('Planted') is None and index.find('Entity') is not None
+
+    def test_symlinked_directory(self):
+        linked = os.path.join(self.tmp_dir.name, 'shared')
+        write_java_file(os.path.join(linked, 'Shared.java'), 'class Shared {}\n')
+        os.symlink(linked, os.path.join(self.root, 'src/shared'))
+        # a loop is walked once
+        os.symlink(os.path.join(self.root, 'src'), os.path.join(self.root, 'src/com/loop'))
+        index = JavaClassIndex(self.root, self.cache_file)
+        assert index.find_all('Shared') == [os.path.join(self.root, 'src/shared/Shared.java')]
+        assert len(index.find_all('Entity')) == 2
+
+
+class TestJavaHeader(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        write_java_file(path, content)
+        return path
+
+    def test_header(self):
+        path = self._write('Entity.java', '/* License: see http://example.com */\npackage com.a;\n\n'
+                                          'import java.util.List;\nimport static org.junit.Assert.*;\n\n'
+                                          '@Schema(description = "not a class X")\n'
+                                          'public abstract class Entity<T extends Base<T>>\n'
+                                          '        extends com.b.Base<T> implements Serializable, Comparable<T> {\n'
+                                          '    private class Inner {}\n}\n')
+        header = get_java_header(path)
+        assert (header.package, header.class_name, header.kind) == ('com.a', 'Entity', 'class')
+        assert header.imports == ['java.util.List', 'static org.junit.Assert.*']
+        assert header.superclass == 'com.b.Base' and header.interfaces == ['Serializable', 'Comparable']
+        assert header.is_abstract and not header.is_concrete_class
+        assert len(header.lines) == 9
+        assert JavaTools.is_abstract_class(path)
+        assert JavaTools.get_java_class_package_value(path) == 'com.a'
+
+    def test_interface_and_cache(self):
+        path = self._write('Api.java', 'package com.a;\npublic interface Api extends A, B<C> {\n}\n')
+        header = get_java_header(path)
+        assert (header.kind, header.superclass, header.interfaces) == ('interface', None, ['A', 'B'])
+        assert get_java_header(path) is header
+        path = self._write('Api.java', 'package com.a;\npublic class Api extends Base {\n}\n')
+        assert JavaTools.get_extended_class_name_for_file(path) == 'Base'
+        assert not JavaTools.is_abstract_class(path)
+
+    def test_replaced_file_and_alias(self):
+        path = self._write('A.java', 'package com.a;\nclass A extends B {}\n')
+        link = os.path.join(self.tmp_dir.name, 'Link.java')
+        os.symlink(path, link)
+        header = get_java_header(path)
+        assert get_java_header(link) is header and header.path == os.path.realpath(path)
+        # same size and mtime: only the inode changed
+        other = self._write('Other.java', 'package com.a;\nclass A extends C {}\n')
+        st = os.stat(path)
+        os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(other, path)
+        assert get_java_header(path).superclass == 'C'
+
+
+class TestJavaHierarchy(TestCase):
+
+    def setUp(self):
+        set_log_display_override(LogDisplay())
+        self.addCleanup(set_log_display_override, None)
+
+    def test_queries(self):
+        with tempfile.TemporaryDirectory() as root:
+            write_java_file(os.path.join(root, 'com/a/Base.java'),
+                            'package com.a;\npublic abstract class Base implements java.io.Serializable {}\n')
+            write_java_file(os.path.join(root, 'com/a/Named.java'), 'package com.a;\npublic interface Named {}\n')
+            write_java_file(os.path.join(root, 'com/b/User.java'),
+                            'package com.b;\nimport com.a.*;\npublic class User extends Base implements Named {}\n')
+            write_java_file(os.path.join(root, 'com/b/Admin.java'),
+                            'package com.b;\npublic class Admin extends User {}\n')
+            hierarchy = JavaTools.build_hierarchy(root, processes=1)
+            assert hierarchy.get_ancestors('Admin') == ['com.b.User', 'com.a.Base', 'com.a.Named',
+                                                        'java.io.Serializable']
+            assert hierarchy.get_descendants('com.a.Base') == ['com.b.User', 'com.b.Admin']
+            assert hierarchy.get_concrete_subclasses('java.io.Serializable') == ['com.b.User', 'com.b.Admin']
+            assert hierarchy.get_descendants('Named') == ['com.b.User', 'com.b.Admin']
+
+    def test_same_package_shadows_wildcard_import(self):
+        with tempfile.TemporaryDirectory() as root:
+            write_java_file(os.path.join(root, 'com/a/Base.java'), 'package com.a;\npublic class Base {}\n')
+            write_java_file(os.path.join(root, 'com/b/Base.java'), 'package com.b;\npublic class Base {}\n')
+            write_java_file(os.path.join(root, 'com/b/User.java'),
+                            'package com.b;\nimport com.a.*;\npublic class User extends Base {}\n')
+            write_java_file(os.path.join(root, 'com/c/Admin.java'),
+                            'package com.c;\nimport com.a.Base;\nimport com.b.*;\npublic class Admin extends Base {}\n')
+            hierarchy = JavaTools.build_hierarchy(root, processes=1)
+            assert hierarchy.get_ancestors('com.b.User') == ['com.b.Base']
+            # a single-type import shadows both
+            assert hierarchy.get_ancestors('com.c.Admin') == ['com.a.Base']
+
+
+class TestAddImports(TestCase):
+
+    def test_sorted_dedup_single_write(self):
+        with tempfile.TemporaryDirectory() as root:
+            first = os.path.join(root, 'A.java')
+            second = os.path.join(root, 'B.java')
+            write_java_file(first, 'package com.a;\n\nimport java.util.List;\nimport java.util.Set;\n\nclass A {}\n')
+            write_java_file(second, 'package com.a;\n\nclass B {}\n')
+            added = JavaTools.add_imports({first: ['java.util.Map', 'java.util.List', 'java.util.Map', 'com.z.Z'],
+                                           second: ['java.util.List', 'com.b.B']}, processes=1)
+            assert added == {first: ['com.z.Z', 'java.util.Map'], second: ['com.b.B', 'java.util.List']}
+            with open(first) as f:
+                assert f.read() == 'package com.a;\n\nimport com.z.Z;\nimport java.util.List;\nimport java.util.Map;\n' \
+                                   'import java.util.Set;\n\nclass A {}\n'
+            with open(second) as f:
+                assert f.read() == 'package com.a;\n\nimport com.b.B;\nimport java.util.List;\nclass B {}\n'
+            write_java_file(second, 'package com.a;\n\nimport java.util.*;\n\nclass B {}\n')
+            JavaTools.add_import(second, 'java.util.List')
+            with open(second) as f:
+                assert f.read() == 'package com.a;\n\nimport java.util.*;\n\nclass B {}\n'
+
+
+class TestJavaCodeEmitter(TestCase):
+
+    def test_same_output_as_java_tools(self):
+        fields = [('id', 'Long'), ('tags', 'List<String>'), ('id', 'Long')]
+        expected: list[str] = []
+        for property_name, property_class in fields:
+            JavaTools.add_getter(1, property_name, property_class, expected)
+            JavaTools.add_setter(1, property_name, property_class, expected)
+        assert JavaTools.make_accessors(1, fields) == ''.join(expected)
+        emitter = JavaCodeEmitter(1).add_accessors({'id': 'Long'}, add_override=False).add_constructor('entity')
+        assert emitter.getvalue() == ('    public Long getId() { \n        return id; \n    } \n\n'
+                                      '    public void setId(Long id) { \n        this.id = id; \n    } \n\n'
+                                      '    public Entity() {\n    }\n\n')
+
+    def test_grouped_and_unsorted_imports(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'A.java')
+            write_java_file(path, 'package com.a;\n\nimport java.util.List;\nimport java.util.Set;\n\n'
+                                  'import com.z.A;\nimport com.z.C;\n\nimport static org.junit.Assert.*;\n\nclass A {}\n')
+            JavaTools.add_imports({path: ['com.z.B', 'java.util.Map', 'com.y.D', 'java.io.File']}, processes=1)
+            with open(path) as f:
+                assert f.read() == 'package com.a;\n\nimport java.io.File;\nimport java.util.List;\n' \
+                                   'import java.util.Map;\nimport java.util.Set;\n\nimport com.y.D;\nimport com.z.A;\n' \
+                                   'import com.z.B;\nimport com.z.C;\n\nimport static org.junit.Assert.*;\n\nclass A {}\n'
+            write_java_file(path, 'package com.a;\nimport b.B;\nimport a.A;\nclass A {}\n')
+            JavaTools.add_import(path, 'a.C')
+            with open(path) as f:
+                assert f.read() == 'package com.a;\nimport b.B;\nimport a.A;\nimport a.C;\nclass A {}\n'
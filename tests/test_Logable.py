@@ -0,0 +1,27 @@
+import io
+import json
+from contextlib import redirect_stdout
+from unittest import TestCase, skipIf
+
+try:
+    from boxtools.extendables.Logable import Logable
+except ImportError:
+    # dateUtils needs pandas
+    Logable = None
+
+
+@skipIf(Logable is None, 'Logable dependencies are not installed')
+class TestStructuredLogable(TestCase):
+
+    def test_events(self):
+        logable = Logable('unused.log', unit_test_mode=True, structured=True)
+        with redirect_stdout(io.StringIO()) as out:
+            logable.tlog('started', headers=['BTC'])
+            try:
+                raise ValueError('boom')
+            except ValueError as e:
+                logable.log_error(e, 'run', show_details=False)
+        tlog_event, error_event = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert tlog_event['level'] == 'INFO' and tlog_event['msg'] == 'started' and tlog_event['headers'] == ['BTC']
+        assert error_event['level'] == 'ERROR' and error_event['method'] == 'run'
+        assert error_event['exc'] == {'type': 'ValueError', 'repr': "ValueError('boom')"}
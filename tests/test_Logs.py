@@ -0,0 +1,175 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+from boxtools.Logs import LogDisplay, LogLevel, get_log_display, set_log_display_override, clear_log_display_cache, \
+    print_str_array
+from boxtools.data.util.jsonLogUtils import format_json_event
+
+
+class TestLogDisplayFactory(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ini_path = os.path.join(self.tmp_dir.name, 'app.ini')
+        self._write_level(LogLevel.INFO)
+        clear_log_display_cache()
+        patcher = patch('boxtools.Logs.get_box_config_ini_file_path', return_value=self.ini_path)
+        self.ini_path_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        set_log_display_override(None)
+        clear_log_display_cache()
+        self.tmp_dir.cleanup()
+
+    def _write_level(self, level: int):
+        with open(self.ini_path, 'w') as f:
+            f.write(f'[SETTINGS]\nLOG_LEVEL = {level}\n')
+
+    def test_log_display_is_shared(self):
+        log_display = LogDisplay().get_log_display()
+        assert log_display.get_log_level() == LogLevel.INFO
+        assert get_log_display() is log_display
+        assert self.ini_path_mock.call_count == 1
+
+    def test_ini_change_invalidates(self):
+        assert get_log_display().get_log_level() == LogLevel.INFO
+        self._write_level(LogLevel.DEBUG)
+        assert get_log_display().get_log_level() == LogLevel.DEBUG
+
+    def test_override(self):
+        forced = LogDisplay(LogLevel.DEBUG)
+        set_log_display_override(forced)
+        assert LogDisplay().get_log_display() is forced
+        set_log_display_override(None)
+        assert get_log_display().get_log_level() == LogLevel.INFO
+
+
+class TestLazyFormatting(TestCase):
+
+    def test_disabled_level_skips_rendering(self):
+        log_display = LogDisplay(LogLevel.SILENT)
+        calls = []
+        with redirect_stdout(io.StringIO()) as out:
+            log_display.show_debug_log(lambda: calls.append('rendered') or 'never')
+            log_display.show_debug_log(' - Parsing SQL: {}', 'select 1')
+        assert calls == []
+        assert out.getvalue() == ''
+        assert not log_display.is_enabled(LogLevel.DEBUG)
+
+    def test_enabled_level_renders(self):
+        log_display = LogDisplay(LogLevel.DEBUG)
+        with redirect_stdout(io.StringIO()) as out:
+            log_display.show_debug_log(' - Parsing SQL: {}', 'select 1')
+            log_display.show_info_log(lambda: 'from callable')
+            log_display.show_log('{} kept as is')
+        assert out.getvalue() == ' - Parsing SQL: select 1\nfrom callable\n{} kept as is\n'
+
+
+class TestShowArray(TestCase):
+
+    def test_list_and_generator_render_the_same(self):
+        rows = [['name', 'value'], ['a', '1'], ['bb', '22']]
+        with patch('os.get_terminal_size', return_value=os.terminal_size((20, 10))):
+            from_list = io.StringIO()
+            LogDisplay().show_array(rows, stream=from_list)
+            from_generator = io.StringIO()
+            LogDisplay().show_array((row for row in rows), stream=from_generator, chunk_size=8)
+        assert from_list.getvalue() == 'name | value\n' + '-' * 20 + '\na    | 1    \nbb   | 22   \n'
+        assert from_generator.getvalue() == from_list.getvalue()
+
+    def test_rows_wider_than_sample(self):
+        rows = [['h1', 'h2'], ['a', 'b'], ['longer value', 'c', 'extra']]
+        with patch('os.get_terminal_size', return_value=os.terminal_size((40, 10))):
+            out = io.StringIO()
+            LogDisplay().show_array(iter(rows), stream=out, sample_size=2)
+        assert out.getvalue().splitlines()[-1] == 'longer value | c  | extra'
+
+    def test_print_str_array_single_pass(self):
+        consumed = []
+
+        def rows():
+            for row in [['name', 'value'], ['a', '1']]:
+                consumed.append(row)
+                yield row
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'table.txt')
+            with patch('os.get_terminal_size', return_value=os.terminal_size((20, 10))), \
+                    redirect_stdout(io.StringIO()) as out:
+                print_str_array(['title'], rows(), file_path=file_path, logger=LogDisplay())
+            with open(file_path) as f:
+                file_content = f.read()
+        assert len(consumed) == 2
+        assert out.getvalue() == 'title\nname | value\n' + '-' * 20 + '\na    | 1    \n'
+        assert file_content == ('title\n' + '     name       |      value     \n' + '-' * 33 + '\n'
+                                + 'a               |               1\n')
+
+
+    def test_failing_rows_keep_previous_file(self):
+        def rows():
+            yield ['name', 'value']
+            raise RuntimeError('source failed')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'table.txt')
+            with open(file_path, 'w') as f:
+                f.write('previous table\n')
+            with self.assertRaises(RuntimeError):
+                print_str_array(['title'], rows(), file_path=file_path)
+            with open(file_path) as f:
+                assert f.read() == 'previous table\n'
+            assert os.listdir(tmp_dir) == ['table.txt']
+
+class TestColorLog(TestCase):
+
+    def test_color_log_template_args(self):
+        with redirect_stdout(io.StringIO()) as out:
+            LogDisplay(LogLevel.SILENT).show_color_log('<', 'value: {}', LogLevel.SILENT, '>', 42)
+            LogDisplay(LogLevel.SILENT).show_color_log('<', 'hidden {}', LogLevel.DEBUG, '>', 1)
+            # positional level, as before template args were supported
+            LogDisplay(LogLevel.SILENT).show_color_log('<', 'hidden', LogLevel.DEBUG)
+            LogDisplay(LogLevel.INFO).show_color_log('<', 'shown', LogLevel.INFO, '>')
+        assert out.getvalue() == '<value: 42>\n<shown>\n'
+
+
+class TestStructuredLog(TestCase):
+
+    def test_color_log_is_a_json_event(self):
+        with redirect_stdout(io.StringIO()) as out:
+            LogDisplay(LogLevel.INFO, structured=True).show_title_log('value: {}', 'a"b')
+        event = json.loads(out.getvalue())
+        assert event['level'] == 'INFO'
+        assert event['msg'] == 'value: a"b'
+        assert '\033' not in out.getvalue()
+
+    def test_array_rows_are_events(self):
+        out = io.StringIO()
+        LogDisplay(LogLevel.SILENT, structured=True).show_array([['name', 'value'], ['a', 1]], stream=out)
+        assert [json.loads(line)['msg'] for line in out.getvalue().splitlines()] == [['name', 'value'], ['a', 1]]
+
+    def test_error_event(self):
+        try:
+            raise ValueError('boom')
+        except ValueError as e:
+            event = json.loads(format_json_event('ERROR', 'Error on run()', method='run', error=e,
+                                                 with_traceback=False, ts=1.5))
+        assert event == {'level': 'ERROR', 'ts': 1.5, 'msg': 'Error on run()', 'method': 'run',
+                         'exc': {'type': 'ValueError', 'repr': "ValueError('boom')"}}
+
+    def test_tables_and_critical_log_are_events(self):
+        logger = LogDisplay(LogLevel.SILENT, structured=True)
+        with tempfile.TemporaryDirectory() as tmp_dir, redirect_stdout(io.StringIO()) as out:
+            file_path = os.path.join(tmp_dir, 'table.txt')
+            print_str_array(['title'], iter([['name', 'value'], ['a', 'b']]), file_path=file_path, logger=logger)
+            logger.show_critical_log('failed: {}', 'x')
+            with open(file_path) as f:
+                assert 'name' in f.read()
+        events = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [event['msg'] for event in events] == ['title', ['name', 'value'], ['a', 'b'], 'failed: x']
+        assert events[-1]['level'] == 'CRITICAL'